@@ -0,0 +1,247 @@
+import argparse
+import random
+import time
+import tracemalloc
+import numpy as np
+from fc_utils import Tree
+from examReview import (preprocessStocks, getAverage, countSublists, PrefixSumIndex,
+                        productExceptSelf, balanceIndex, nextGreaterElement,
+                        countSublistsParallel, dailyTemperatures, stockSpan, findKthLargest,
+                        topKFrequent, topKFrequentParallel, kSmallestPairs, fastestPizzaProduction,
+                        fastestGradingTime, minMeetingRooms, minMeetingRoomsSweep,
+                        leastInterval,
+                        powerset, solveKnightsTour, solveMiniSudoku,
+                        getTreePreorder, maxBranchSum, dfsSearch, iterativeDFS,
+                        bfs, singleSourceShortestPath,
+                        singleSourceShortestPathWithReconstruction, bellmanFord)
+################################################################################
+# Benchmarks for examReview.py
+#
+# Each benchmark is (family, name, makeInput, run, sizes[, scalable]):
+#   makeInput(n) builds a synthetic input of size n (outside the timed region)
+#   run(input) calls the algorithm under test
+#   scalable (default True) is False when n is combinatorial (a powerset
+#   length, a board size, a recursion depth), so --scale leaves it alone
+#
+# For every size we record the best wall time over `repeat` runs and the peak
+# memory allocated by one run (tracemalloc), so scaling curves and
+# regressions show up as rows in the table.
+#
+# Usage: python benchmarkExamReview.py [--family heap] [--repeat 3] [--scale 0.1]
+################################################################################
+
+################################################################################
+# Synthetic input generators
+################################################################################
+def randomList(n, low=-100, high=100, seed=0):
+    rng = random.Random(seed)
+    return [rng.randint(low, high) for _ in range(n)]
+
+def randomPrices(n, seed=0):
+    rng = random.Random(seed)
+    prices = [100.0]
+    for _ in range(n - 1):
+        prices.append(max(1.0, prices[-1] + rng.gauss(0, 1)))
+    return prices
+
+def randomIntervals(n, seed=0):
+    rng = random.Random(seed)
+    intervals = []
+    for _ in range(n):
+        start = rng.randint(0, 10 * n)
+        intervals.append((start, start + rng.randint(1, 100)))
+    return intervals
+
+def randomGraph(numNodes, degree=4, low=1, high=100, seed=0):
+    """
+    Return a weighted digraph {node : {neighbor : weight}} on nodes 0..n-1.
+    Every node i also has an edge to i + 1, so node 0 reaches everything.
+    """
+    rng = random.Random(seed)
+    graph = {node : {} for node in range(numNodes)}
+    for node in range(numNodes):
+        if node + 1 < numNodes:
+            graph[node][node + 1] = rng.randint(low, high)
+        for _ in range(degree - 1):
+            graph[node][rng.randrange(numNodes)] = rng.randint(low, high)
+    return graph
+
+def randomUnweightedGraph(numNodes, degree=4, seed=0):
+    graph = randomGraph(numNodes, degree, seed=seed)
+    return {node : list(neighbors) for node, neighbors in graph.items()}
+
+def deepTree(depth):
+    tree = Tree(depth)
+    for value in range(depth - 1, 0, -1):
+        tree = Tree(value, tree)
+    return tree
+
+def wideTree(width):
+    return Tree(0, *[Tree(value, Tree(-value)) for value in range(1, width + 1)])
+
+def sortedList(n, seed=0):
+    return sorted(randomList(n, 0, 10 * n, seed))
+
+################################################################################
+# Benchmark registry
+################################################################################
+def prefixAverages(prices):
+    preprocessed = preprocessStocks(prices)
+    for i in range(0, len(prices) - 1, 7):
+        getAverage(preprocessed, i, len(prices))
+
+BENCHMARKS = [
+    # Prefix
+    ('prefix', 'preprocessStocks+getAverage', randomPrices, prefixAverages,
+     [10**4, 10**5, 10**6]),
+    ('prefix', 'countSublists', randomList, lambda L: countSublists(L, 7),
+     [10**4, 10**5, 10**6]),
+    # 20 targets over the same list: one index vs one countSublists per target
+    ('prefix', 'countSublists x20 targets', randomList,
+     lambda L: [countSublists(L, k) for k in range(-10, 10)], [10**4, 10**5, 10**6]),
+    ('prefix', 'PrefixSumIndex.counts (20 targets)', randomList,
+     lambda L: PrefixSumIndex(L).counts(range(-10, 10)), [10**4, 10**5, 10**6]),
+    ('prefix', 'productExceptSelf', lambda n: randomList(n, 1, 3),
+     productExceptSelf, [10**3, 10**4, 3 * 10**4]),
+    ('prefix', 'balanceIndex', randomList, balanceIndex, [10**4, 10**5, 10**6]),
+
+    # Monotonic stack
+    ('stack', 'nextGreaterElement', randomList, nextGreaterElement,
+     [10**4, 10**5, 10**6]),
+    ('stack', 'dailyTemperatures', lambda n: randomList(n, 30, 100),
+     dailyTemperatures, [10**4, 10**5, 10**6]),
+    ('stack', 'stockSpan', randomList, stockSpan, [10**4, 10**5, 10**6]),
+
+    # Heap
+    ('heap', 'findKthLargest', randomList, lambda L: findKthLargest(L, min(100, len(L))),
+     [10**4, 10**5, 10**6]),
+    ('heap', 'topKFrequent', lambda n: randomList(n, 0, n // 10),
+     lambda L: topKFrequent(L, 10), [10**4, 10**5, 10**6]),
+    ('heap', 'kSmallestPairs', lambda n: (sortedList(n), sortedList(n, 1)),
+     lambda args: kSmallestPairs(args[0], args[1], len(args[0])),
+     [10**3, 10**4, 10**5]),
+
+    # Parallel versions: one row per worker count shows the speedup per core
+    ('parallel', 'topKFrequent (baseline)', lambda n: randomList(n, 0, n // 10),
+     lambda L: topKFrequent(L, 10), [10**6, 4 * 10**6]),
+    *[('parallel', f'topKFrequentParallel x{numWorkers}',
+       lambda n: randomList(n, 0, n // 10),
+       lambda L, numWorkers=numWorkers: topKFrequentParallel(L, 10, numWorkers),
+       [10**6, 4 * 10**6]) for numWorkers in [1, 2, 4, 8]],
+    ('parallel', 'countSublists (baseline)', randomList,
+     lambda L: countSublists(L, 7), [10**6, 4 * 10**6]),
+    *[('parallel', f'countSublistsParallel x{numWorkers}', randomList,
+       lambda L, numWorkers=numWorkers: countSublistsParallel(L, 7, numWorkers),
+       [10**6, 4 * 10**6]) for numWorkers in [2, 4, 8]],
+
+    # Simulation
+    # simulate vs binarySearch: the rows show where the two cross over
+    ('simulation', 'fastestPizzaProduction (simulate)',
+     lambda n: (randomList(100, 1, 20), n),
+     lambda args: fastestPizzaProduction(*args, method='simulate'),
+     [10, 100, 10**3, 10**4, 10**5, 10**6]),
+    ('simulation', 'fastestPizzaProduction (binarySearch)',
+     lambda n: (randomList(100, 1, 20), n),
+     lambda args: fastestPizzaProduction(*args, method='binarySearch'),
+     [10, 100, 10**3, 10**4, 10**5, 10**6, 10**9]),
+    ('simulation', 'fastestGradingTime',
+     lambda n: (randomList(100, 5, 20), randomList(100, 0, 4, 1), n),
+     lambda args: fastestGradingTime(*args), [10**4, 10**5, 10**6]),
+    ('simulation', 'minMeetingRooms', randomIntervals, minMeetingRooms,
+     [10**4, 10**5, 10**6]),
+    ('simulation', 'minMeetingRoomsSweep', lambda n: np.array(randomIntervals(n)),
+     minMeetingRoomsSweep, [10**4, 10**5, 10**6]),
+    *[('simulation', f'leastInterval ({mode}, cooldown 1000)',
+       lambda n: (randomList(n, 0, 25), 1000),
+       lambda args, mode=mode: leastInterval(*args, mode=mode), [10**3, 10**4, 10**5])
+      for mode in ['simulate', 'jump', 'formula']],
+
+    # Backtracking
+    ('backtracking', 'powerset', lambda n: list(range(n)), powerset, [10, 14, 16], False),
+    ('backtracking', 'solveKnightsTour (3 x n)', lambda n: (3, n),
+     lambda args: solveKnightsTour(*args), [4, 7, 8], False),
+    ('backtracking', 'solveMiniSudoku', lambda n: [[0] * 4 for _ in range(4)],
+     solveMiniSudoku, [4], False),
+
+    # Tree / graph traversal
+    ('tree', 'getTreePreorder (deep)', deepTree, getTreePreorder, [100, 300, 900], False),
+    ('tree', 'getTreePreorder (wide)', wideTree, getTreePreorder,
+     [10**3, 10**4, 10**5]),
+    ('tree', 'maxBranchSum (wide)', wideTree, maxBranchSum, [10**3, 10**4, 10**5]),
+    ('tree', 'dfsSearch (deep)', deepTree, lambda t: dfsSearch(t, -1), [100, 300, 900],
+     False),
+    ('tree', 'iterativeDFS', randomUnweightedGraph, lambda g: iterativeDFS(g, 0),
+     [10**2, 10**3, 3 * 10**3]),
+    ('tree', 'bfs', randomUnweightedGraph, lambda g: bfs(g, 0),
+     [10**2, 10**3, 3 * 10**3]),
+
+    # Shortest paths
+    ('shortestPath', 'singleSourceShortestPath', randomGraph,
+     lambda g: singleSourceShortestPath(g, 0), [10**3, 10**4, 10**5]),
+    ('shortestPath', 'singleSourceShortestPathWithReconstruction', randomGraph,
+     lambda g: singleSourceShortestPathWithReconstruction(g, 0), [10**2, 10**3, 3 * 10**3]),
+    ('shortestPath', 'bellmanFord', randomGraph, lambda g: bellmanFord(g, 0),
+     [25, 50, 100]),
+]
+
+################################################################################
+# Runner
+################################################################################
+def benchmark(makeInput, run, n, repeat=3):
+    """
+    Return (best seconds over `repeat` runs, peak bytes allocated by one run).
+
+    A fresh input is built for every run, in case the algorithm mutates
+    its input.
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        data = makeInput(n)
+        start = time.perf_counter()
+        run(data)
+        best = min(best, time.perf_counter() - start)
+
+    data = makeInput(n)
+    tracemalloc.start()
+    run(data)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+def runBenchmarks(benchmarks, repeat=3, scale=1.0):
+    """
+    Run every benchmark at every size and return rows
+    (family, name, n, seconds, peakBytes). `scale` multiplies every size of
+    the scalable benchmarks; sizes that collapse onto each other after
+    rounding are run once, so a row's sizes stay increasing.
+    """
+    rows = []
+    for family, name, makeInput, run, sizes, *options in benchmarks:
+        scalable = options[0] if options else True
+        if scalable:
+            sizes = sorted({max(1, int(n * scale)) for n in sizes})
+        for n in sizes:
+            seconds, peak = benchmark(makeInput, run, n, repeat)
+            rows.append((family, name, n, seconds, peak))
+            printRow(rows[-1])
+    return rows
+
+def printRow(row):
+    family, name, n, seconds, peak = row
+    print(f'{family:<14}{name:<46}{n:>10}{seconds * 1000:>12.2f} ms{peak / 2**20:>10.2f} MiB')
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark examReview.py')
+    parser.add_argument('--family', help='only run this family')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--scale', type=float, default=1.0,
+                        help='multiply every input size by this factor '
+                             '(combinatorial sizes are kept as is)')
+    args = parser.parse_args()
+
+    benchmarks = [b for b in BENCHMARKS if args.family in (None, b[0])]
+    print(f'{"family":<14}{"name":<46}{"n":>10}{"time":>15}{"peak":>14}')
+    runBenchmarks(benchmarks, args.repeat, args.scale)
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,17 @@
 from fc_utils import almostEqual, Tree
 import heapq
+import itertools
+import array
+import bisect
 import copy
+import functools
+import operator
 from collections import Counter, deque
+import math
+import multiprocessing
+import os
+import tempfile
+import numpy as np
 ################################################################################
 # Algorithm Name: Prefix or Preprocessing Pattern
 # preprocessed = [initial value] * (n + 1)
@@ -22,13 +32,10 @@ def preprocessStocks(prices):
             the price at time i.
     
     Returns:
-        list[float]: A preprocessed data structure that supports O(1) 
+        PriceSeries: A preprocessed data structure that supports O(1) 
             average queries.
     """
-    preprocessed = [0] * (len(prices) + 1)
-    for i in range(len(prices)):
-        preprocessed[i + 1] = preprocessed[i] + prices[i]
-    return preprocessed
+    return PriceSeries(prices)
 
 def getAverage(preprocessed, i, j):
     """
@@ -36,16 +43,227 @@ def getAverage(preprocessed, i, j):
     the preprocessed data.
 
     Args:
-        preprocessed (list[float]): The prefix-sum or equivalent data
-            structure produced by `preprocessStocks`.
+        preprocessed (PriceSeries | list[float]): The structure produced by
+            `preprocessStocks`, or a plain prefix-sum list.
         i (int): Start index (inclusive).
         j (int): End index (exclusive).
     
     Returns:
         float: Average stock price in the range [i, j).
     """
+    if hasattr(preprocessed, 'average'):
+        return preprocessed.average(i, j)
     return (preprocessed[j] - preprocessed[i]) / (j - i)
 
+def compensatedCumsum(values, blockSize=1024):
+    """
+    Return the running sum of values with error bounded by the block size.
+
+    A plain float64 cumulative sum accumulates rounding error proportional to
+    the length of the series. Here each block of `blockSize` elements gets its
+    own local cumulative sum, and the block offsets are accumulated with Kahan
+    summation, so the error no longer grows with N.
+
+    Args:
+        values (np.ndarray): 1-D float64 array.
+        blockSize (int): Number of elements summed locally per block.
+
+    Returns:
+        np.ndarray: Array res with res[i] == sum(values[:i + 1]).
+
+    Time Complexity: O(N) vectorized, plus O(N / blockSize) Python steps.
+    """
+    n = len(values)
+    res = np.empty(n, dtype=np.float64)
+    total = compensation = 0.0
+    for start in range(0, n, blockSize):
+        block = values[start:start + blockSize]
+        np.cumsum(block, out=res[start:start + blockSize])
+        res[start:start + blockSize] += total
+        # Kahan step on the (pairwise-summed) block total
+        y = float(np.sum(block)) - compensation
+        t = total + y
+        compensation = (t - total) - y
+        total = t
+    return res
+
+class PriceSeries:
+    """
+    NumPy-backed prefix sums over a price series.
+
+    `preprocessed[i]` holds the sum of the first i prices, so the average over
+    [i, j) is answered in O(1), and a whole array of range queries is answered
+    in one vectorized call by `averages`. Like the prefix-sum list it
+    replaces, the series has len(prices) + 1 entries and compares equal to
+    that list.
+    """
+    def __init__(self, prices, compensated=False):
+        prices = np.asarray(prices, dtype=np.float64)
+        self.preprocessed = np.zeros(len(prices) + 1, dtype=np.float64)
+        if compensated:
+            self.preprocessed[1:] = compensatedCumsum(prices)
+        else:
+            np.cumsum(prices, out=self.preprocessed[1:])
+
+    def __len__(self):
+        return len(self.preprocessed)
+
+    def __getitem__(self, i):
+        return self.preprocessed[i]
+
+    def __iter__(self):
+        return iter(self.preprocessed.tolist())
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    def average(self, i, j):
+        """
+        Return the average price in [i, j). Time Complexity: O(1)
+        """
+        return float(self.preprocessed[j] - self.preprocessed[i]) / (j - i)
+
+    def averages(self, starts, ends):
+        """
+        Return the average price of every range [starts[k], ends[k]).
+
+        Args:
+            starts (array-like[int]): Start indices (inclusive).
+            ends (array-like[int]): End indices (exclusive).
+
+        Returns:
+            np.ndarray: Array of float64 averages, one per query.
+
+        Time Complexity: O(Q), vectorized over the Q queries.
+        """
+        starts = np.asarray(starts, dtype=np.intp)
+        ends = np.asarray(ends, dtype=np.intp)
+        return (self.preprocessed[ends] - self.preprocessed[starts]) / (ends - starts)
+
+def savePriceSeries(path, prices, chunkSize=1 << 20):
+    """
+    Write the prefix sums of prices to path as a flat little-endian float64 file.
+
+    The file holds len(prices) + 1 values, exactly `PriceSeries.preprocessed`.
+    Prices are processed chunkSize at a time, so prices may itself be a
+    np.memmap over a raw tick archive larger than RAM.
+
+    Args:
+        path (str): Output file path.
+        prices (array-like[float]): Stock prices in time order.
+        chunkSize (int): Number of prices converted per write.
+    """
+    total = 0.0
+    with open(path, 'wb') as f:
+        f.write(np.zeros(1, dtype='<f8').tobytes())
+        for start in range(0, len(prices), chunkSize):
+            block = np.cumsum(np.asarray(prices[start:start + chunkSize], dtype='<f8'))
+            block += total
+            total = float(block[-1])
+            f.write(block.tobytes())
+
+class MappedPriceSeries(PriceSeries):
+    """
+    A PriceSeries whose prefix sums are memory-mapped from a file written by
+    `savePriceSeries`. Opening is instant and an average over any window
+    reads only the two pages holding its endpoints.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.preprocessed = np.memmap(path, dtype='<f8', mode='r')
+
+class PriceMatrix:
+    """
+    Columnar prefix sums for many symbols at once (symbols x time).
+
+    Row s of `preprocessed` is the prefix-sum array of symbol s, so the
+    average of every symbol over [i, j), or a rolling window average for
+    every symbol, is a single vectorized operation.
+    """
+    def __init__(self, prices):
+        prices = np.asarray(prices, dtype=np.float64)
+        numSymbols, n = prices.shape
+        self.preprocessed = np.zeros((numSymbols, n + 1), dtype=np.float64)
+        np.cumsum(prices, axis=1, out=self.preprocessed[:, 1:])
+
+    def __len__(self):
+        return self.preprocessed.shape[1] - 1
+
+    def averages(self, i, j):
+        """
+        Return the average of every symbol over [i, j). Time Complexity: O(S)
+        """
+        return (self.preprocessed[:, j] - self.preprocessed[:, i]) / (j - i)
+
+    def rollingAverages(self, width):
+        """
+        Return the rolling average of width `width` for every symbol.
+
+        Returns:
+            np.ndarray: Shape (S, N - width + 1); column t is the average
+            over [t, t + width).
+
+        Time Complexity: O(S * N)
+        """
+        return (self.preprocessed[:, width:] - self.preprocessed[:, :-width]) / width
+
+class StreamingPriceSeries:
+    """
+    Append-only prefix sums for a live price feed.
+
+    Prefix sums are stored in fixed-size float64 chunks, so `append` never
+    copies history: when the current chunk is full a new one is allocated.
+    Range averages over any [i, j) seen so far stay O(1).
+    """
+    def __init__(self, chunkSize=4096):
+        self.chunkSize = chunkSize
+        self.chunks = [np.zeros(chunkSize, dtype=np.float64)]
+        self.total = 0.0
+        self.n = 0 # number of prices appended
+
+    def __len__(self):
+        return self.n
+
+    def __getitem__(self, i):
+        if i < 0 or i > self.n:
+            raise IndexError('prefix index out of range')
+        return self.chunks[i // self.chunkSize][i % self.chunkSize]
+
+    def append(self, price):
+        """
+        Add one price to the end of the series. Time Complexity: O(1) amortized
+        """
+        self.total += price
+        self.n += 1
+        chunk, pos = divmod(self.n, self.chunkSize)
+        if chunk == len(self.chunks):
+            self.chunks.append(np.empty(self.chunkSize, dtype=np.float64))
+        self.chunks[chunk][pos] = self.total
+
+    def extend(self, prices):
+        """
+        Append a batch of prices, filling chunks with vectorized cumulative sums.
+        """
+        prices = np.asarray(prices, dtype=np.float64)
+        start = 0
+        while start < len(prices):
+            chunk, pos = divmod(self.n + 1, self.chunkSize)
+            if chunk == len(self.chunks):
+                self.chunks.append(np.empty(self.chunkSize, dtype=np.float64))
+            take = min(self.chunkSize - pos, len(prices) - start)
+            block = self.chunks[chunk][pos:pos + take]
+            np.cumsum(prices[start:start + take], out=block)
+            block += self.total
+            self.total = float(block[-1])
+            self.n += take
+            start += take
+
+    def average(self, i, j):
+        """
+        Return the average price in [i, j). Time Complexity: O(1)
+        """
+        return float(self[j] - self[i]) / (j - i)
+
 def testAveragePrices():
     prices = [3.0, 4.5, 3.6, 3.1, 2.7, 4.8, 5.1]
     preprocessed = preprocessStocks(prices)
@@ -59,6 +277,79 @@ def testAveragePrices():
     assert(almostEqual(getAverage(preprocessed, 1, 6), 3.74))
     assert(almostEqual(getAverage(preprocessed, 2, 5), 3.1333333))
 
+def testPriceSeries():
+    prices = [3.0, 4.5, 3.6, 3.1, 2.7, 4.8, 5.1]
+    series = PriceSeries(prices)
+    assert(len(series) == len(list(series)) == 8) # prefix sums, as before
+    assert(preprocessStocks([1, 2, 3]) == [0, 1, 3, 6])
+    assert(almostEqual(series.average(0, 7), 3.8285714))
+    assert(almostEqual(series.average(2, 5), 3.1333333))
+    res = series.averages([0, 0, 6, 4, 1], [7, 5, 7, 7, 6])
+    expected = [3.8285714, 3.38, 5.1, 4.2, 3.74]
+    assert(all(almostEqual(x, y) for x, y in zip(res, expected)))
+
+    # legacy list-based prefix sums still work with getAverage
+    assert(almostEqual(getAverage([0, 1, 3, 6], 1, 3), 2.5))
+
+    # compensated prefix sums agree with exact summation on long series,
+    # where a plain cumulative sum drifts by ~6e-9
+    prices = [1e8] + [0.1] * 100000
+    plain = PriceSeries(prices)
+    series = PriceSeries(prices, compensated=True)
+    for i, j in [(99000, 100001), (1, 100001), (50000, 50100)]:
+        exact = math.fsum(prices[i:j]) / (j - i)
+        assert(almostEqual(series.average(i, j), exact, 1e-10))
+        assert(not almostEqual(plain.average(i, j), exact, 1e-10))
+
+def testStreamingPriceSeries():
+    prices = [3.0, 4.5, 3.6, 3.1, 2.7, 4.8, 5.1]
+    stream = StreamingPriceSeries(chunkSize=3)
+    for price in prices[:4]:
+        stream.append(price)
+    assert(almostEqual(getAverage(stream, 0, 3), 3.7))
+    stream.extend(prices[4:])
+    assert(len(stream) == 7)
+    assert(len(stream.chunks) == 3)
+    assert(almostEqual(getAverage(stream, 0, 7), 3.8285714))
+    assert(almostEqual(getAverage(stream, 2, 7), 3.86))
+    assert(almostEqual(getAverage(stream, 3, 4), 3.1))
+
+    # mixing append and extend matches the batch prefix sums
+    stream = StreamingPriceSeries(chunkSize=4)
+    stream.extend(range(10))
+    stream.append(10)
+    stream.extend([11, 12])
+    series = PriceSeries(range(13))
+    assert(all(stream[i] == series[i] for i in range(14)))
+
+def testMappedPriceSeries():
+    prices = [3.0, 4.5, 3.6, 3.1, 2.7, 4.8, 5.1]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'prices.f8')
+        savePriceSeries(path, prices, chunkSize=3)
+        assert(os.path.getsize(path) == 8 * (len(prices) + 1))
+        series = MappedPriceSeries(path)
+        assert(len(series) == 8)
+        assert(almostEqual(getAverage(series, 0, 7), 3.8285714))
+        assert(almostEqual(getAverage(series, 1, 6), 3.74))
+        res = series.averages([0, 2], [3, 5])
+        assert(all(almostEqual(x, y) for x, y in zip(res, [3.7, 3.1333333])))
+        del series, res # release the mapping before the directory is removed
+
+def testPriceMatrix():
+    prices = [[3.0, 4.5, 3.6, 3.1, 2.7, 4.8, 5.1],
+              [1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0]]
+    matrix = PriceMatrix(prices)
+    assert(len(matrix) == 7)
+    res = matrix.averages(2, 5)
+    assert(almostEqual(res[0], 3.1333333) and almostEqual(res[1], 4.0))
+    rolling = matrix.rollingAverages(3)
+    assert(rolling.shape == (2, 5))
+    for s in range(2):
+        series = PriceSeries(prices[s])
+        for t in range(5):
+            assert(almostEqual(rolling[s, t], series.average(t, t + 3)))
+
 # Example: countSublists
 def countSublists(L, k):
     """
@@ -110,6 +401,247 @@ def testCountSublists():
     assert(countSublists(L, 5) == 1)
     assert(countSublists(L, 0) == 0)
 
+def countSublistsWindowed(L, k, maxLength):
+    """
+    Count the non-empty sublists of length <= maxLength whose sum equals k.
+
+    Same one-pass prefix-sum hashmap as `countSublists`, but preMap only
+    holds the last maxLength prefix sums: the oldest one is evicted as the
+    window slides, so memory is O(maxLength) instead of O(N).
+
+    Time Complexity: O(N)
+    """
+    preMap = {0 : 1}
+    preSums = deque([0]) # prefix sums currently in preMap, oldest first
+    preSum = res = 0
+    for elem in L:
+        preSum += elem
+        res += preMap.get(preSum - k, 0)
+        preMap[preSum] = 1 + preMap.get(preSum, 0)
+        preSums.append(preSum)
+        if len(preSums) > maxLength:
+            oldest = preSums.popleft()
+            preMap[oldest] -= 1
+            if preMap[oldest] == 0:
+                del preMap[oldest]
+    return res
+
+class PrefixSumIndex:
+    """
+    Prefix sums of L sorted once, answering countSublists for many targets.
+
+    Every prefix position is stored under the key rank(value) * (n + 1) + pos
+    in one sorted array, so "how many earlier prefix sums equal P[b] - k"
+    (optionally only among the last maxLength positions) is a binary
+    search, done for all b at once with NumPy. The b are walked in key
+    order: P[b] - k then grows with b, so every search gets sorted needles
+    and costs about as much as a linear merge.
+    """
+    def __init__(self, L):
+        self.n = len(L)
+        self.preprocessed = np.zeros(self.n + 1, dtype=np.int64)
+        np.cumsum(np.asarray(L, dtype=np.int64), out=self.preprocessed[1:])
+        self.values, ranks = np.unique(self.preprocessed, return_inverse=True)
+        self.keys = np.sort(ranks.astype(np.int64) * (self.n + 1) + np.arange(self.n + 1))
+        self.ends = self.keys % (self.n + 1)  # prefix positions in key order
+        self.sortedPre = self.preprocessed[self.ends]
+        self.groupStarts = np.searchsorted(self.keys, np.arange(len(self.values)) * (self.n + 1))
+
+    def count(self, k, maxLength=None):
+        """
+        Return countSublists(L, k), restricted to sublists of length
+        <= maxLength when given. Time Complexity: O(N log N), vectorized
+        """
+        return self.counts([k], maxLength)[0]
+
+    def counts(self, targets, maxLength=None, blockSize=2**20):
+        """
+        Return [count(k) for k in targets], answering the targets in blocks
+        of about blockSize (target, prefix) pairs per vectorized pass.
+        """
+        targets = np.asarray(targets, dtype=np.int64)
+        if self.n == 0:
+            return [0] * len(targets)
+        res = []
+        step = max(1, blockSize // (self.n + 1))
+        for block in range(0, len(targets), step):
+            ks = targets[block:block + step]
+            wanted = (self.sortedPre - ks[:, None]).ravel()
+            ranks = np.minimum(np.searchsorted(self.values, wanted), len(self.values) - 1)
+            found = self.values[ranks] == wanted
+            base = ranks * (self.n + 1)
+            ends = np.tile(self.ends, len(ks))
+            if maxLength is None:
+                starts = self.groupStarts[ranks]
+            else:
+                starts = np.searchsorted(self.keys, base + np.maximum(ends - maxLength, 0))
+            matches = np.searchsorted(self.keys, base + ends) - starts
+            matches[~found] = 0
+            res.extend(matches.reshape(len(ks), -1).sum(axis=1).tolist())
+        return res
+
+def countPairsWithDifference(values, groups, k, weights=None):
+    """
+    Return the number of pairs (a, b) with groups[a] < groups[b] and
+    values[b] - values[a] == k, each counted weights[a] * weights[b] times.
+
+    Every element is packed into one int64 key (value, group, weight) and
+    the keys are sorted once; the matches of b are then the keys between
+    (values[b] - k, 0) and (values[b] - k, groups[b]), two binary searches
+    whose needles are already sorted. A running sum of the weights turns
+    that key range into a weighted count. The caller makes sure the packed
+    keys fit in int64.
+
+    Args:
+        values (np.ndarray): int64 values.
+        groups (np.ndarray): Non-decreasing non-negative int64 group ids.
+        k (int): Target difference.
+        weights (np.ndarray, optional): Positive int64 weights, default 1.
+
+    Time Complexity: O(N log N)
+    """
+    numGroups = int(groups[-1]) + 1
+    scale = 1 if weights is None else int(weights.max()) + 1
+    keys = values - int(values.min())
+    keys *= numGroups
+    keys += groups
+    if weights is not None:
+        keys *= scale
+        keys += weights
+    keys.sort()
+    if weights is None:
+        sortedWeights = np.ones(len(keys), dtype=np.int64)
+        sortedGroups = keys.copy()
+    else:
+        sortedWeights = keys % scale
+        sortedGroups = keys // scale
+    running = np.zeros(len(keys) + 1, dtype=np.int64)
+    np.cumsum(sortedWeights, out=running[1:])
+    targets = sortedGroups // numGroups - k
+    sortedGroups %= numGroups
+    targets *= numGroups
+    first = np.searchsorted(keys, targets * scale)
+    targets += sortedGroups
+    last = np.searchsorted(keys, targets * scale)
+    return int(np.dot(sortedWeights, running[last] - running[first]))
+
+def countSublistsChunk(chunk, k):
+    """
+    Worker step of `countSublistsParallel` for one chunk of L.
+
+    Prefix sums are taken relative to the start of the chunk, and the zero
+    prefix at the chunk boundary is left out: it belongs to the previous
+    chunk, so the merge step counts it there.
+
+    Returns:
+        tuple: (number of sublists summing to k that lie inside the chunk,
+        sorted distinct local prefix sums, their frequencies, sum of the chunk)
+    """
+    local = np.cumsum(chunk, dtype=np.int64)
+    res = countPairsWithDifference(local, np.arange(len(local)), k)
+    values, freqs = np.unique(local, return_counts=True)
+    return res, values, freqs, int(local[-1])
+
+def countSublistsParallel(L, k, numWorkers=None, chunkSize=None):
+    """
+    Return countSublists(L, k), computing chunk histograms in parallel.
+
+    Each worker runs `countSublistsChunk` on a contiguous chunk of L and
+    returns its local prefix sums as sorted (values, frequencies) arrays.
+    Shifted by the chunk's global offset, these are weighted values grouped
+    by chunk, with the zero prefix before L as group 0; the sublists that
+    cross chunks are exactly the pairs from earlier to later groups whose
+    values differ by k, so the merge is one `countPairsWithDifference`
+    call instead of a dict walk over every histogram.
+
+    Args:
+        L (list[int]): List of integers.
+        k (int): Target sum value.
+        numWorkers (int, optional): Number of processes. Defaults to the
+            number of CPUs.
+        chunkSize (int, optional): Elements per chunk. Defaults to an even
+            split into 4 chunks per worker.
+
+    Returns:
+        int: Number of non-empty sublists whose sum equals k.
+
+    Time Complexity: O((N / P) log N) per worker plus O(G log G) to merge,
+    where G is the total number of distinct local prefix sums. Inputs whose
+    packed sort keys could overflow int64 fall back to `countSublists`.
+    """
+    numWorkers = numWorkers or os.cpu_count() or 1
+    if chunkSize is None:
+        chunkSize = max(1, -(-len(L) // (4 * numWorkers)))
+    if numWorkers == 1 or len(L) <= chunkSize:
+        return countSublists(L, k)
+    try:
+        arr = np.asarray(L, dtype=np.int64)
+    except OverflowError:
+        return countSublists(L, k)
+    if int(np.abs(arr).max()) * len(arr) >= 2**63:
+        return countSublists(L, k)
+    preSums = np.cumsum(arr)
+    span = max(int(preSums.max()), 0) - min(int(preSums.min()), 0) + abs(k) + 1
+    del preSums
+    numChunks = -(-len(arr) // chunkSize)
+    if span * (numChunks + 1) * (chunkSize + 1) >= 2**63:
+        return countSublists(L, k)
+
+    chunks = (arr[start:start + chunkSize] for start in range(0, len(arr), chunkSize))
+    # the zero prefix before L is group 0
+    values = [np.zeros(1, dtype=np.int64)]
+    groups = [np.zeros(1, dtype=np.int64)]
+    freqs = [np.ones(1, dtype=np.int64)]
+    offset = res = 0
+    with multiprocessing.Pool(numWorkers) as pool:
+        for chunkRes, chunkValues, chunkFreqs, chunkSum in pool.imap(functools.partial(countSublistsChunk, k=k), chunks):
+            res += chunkRes
+            values.append(chunkValues + offset)
+            groups.append(np.full(len(chunkValues), len(groups), dtype=np.int64))
+            freqs.append(chunkFreqs)
+            offset += chunkSum
+    return res + countPairsWithDifference(np.concatenate(values), np.concatenate(groups),
+                                          k, np.concatenate(freqs))
+
+def testPrefixSumIndex():
+    L = [3, 4, 7, 2, -3, 1, 4, 2]
+    index = PrefixSumIndex(L)
+    assert(index.counts([7, 4, 5, 0, 100]) == [4, 4, 1, 1, 0])
+    assert(index.counts([7, 4, 5, 0, 100], blockSize=1) == [4, 4, 1, 1, 0])
+    assert(index.counts([7, 4, 5], maxLength=3, blockSize=20) == [3, 2, 1])
+    # [7], [3, 4] and [1, 4, 2] have length <= 3, but [7, 2, -3, 1] does not
+    assert(index.count(7, maxLength=3) == 3)
+    assert(countSublistsWindowed(L, 7, 3) == 3)
+    assert(index.count(4, maxLength=1) == 2)
+    assert(countSublistsWindowed(L, 4, 1) == 2)
+
+    L = [0, 0]
+    assert(PrefixSumIndex(L).counts([0, 1]) == [3, 0])
+    assert(countSublistsWindowed(L, 0, 1) == 2)
+    assert(PrefixSumIndex([]).count(0) == 0)
+
+    L = [1, 2, 1, 2, 1]
+    index = PrefixSumIndex(L)
+    for k in range(-1, 9):
+        for maxLength in range(1, 7):
+            assert(index.count(k, maxLength) == countSublistsWindowed(L, k, maxLength))
+        assert(index.count(k) == countSublists(L, k))
+
+def testCountSublistsParallel():
+    L = [3, 4, 7, 2, -3, 1, 4, 2]
+    for k in [7, 4, 5, 0]:
+        for chunkSize in [1, 2, 3, 5]:
+            assert(countSublistsParallel(L, k, 2, chunkSize) == countSublists(L, k))
+
+    L = [0, 0, 0, 0, 1, -1, 0]
+    assert(countSublistsParallel(L, 0, 3, 2) == countSublists(L, 0))
+    assert(countSublistsParallel([5], 5, 2) == 1)
+    assert(countSublistsParallel([], 0, 2) == 0)
+
+    L = [(i * 37) % 11 - 5 for i in range(500)]
+    for k in [-3, 0, 4]:
+        assert(countSublistsParallel(L, k, 3, 37) == countSublists(L, k))
+
 def productExceptSelf(L):
     """
     Return a list where each element is the product of all other elements in L.
@@ -146,6 +678,63 @@ def testProductExceptSelf():
     assert(productExceptSelf([3, 6, 5]) == [30, 15, 18])
     assert(productExceptSelf([1, 2]) == [2, 1])
 
+def productExceptSelfVectorized(L, blockSize=4096):
+    """
+    NumPy version of `productExceptSelf` that allocates one output buffer.
+
+    The output first receives the prefix products (exclusive of self) from
+    one cumulative product. The suffix products are then folded into it in
+    place, block by block from the right, so the only scratch memory is one
+    block. Array inputs are used without copying. Integer products that
+    could overflow the input's dtype (bounded by the sum of log2|x| over
+    the nonzero elements) are computed on Python ints in an object array.
+
+    Args:
+        L (array-like[int]): At least two numbers.
+        blockSize (int): Scratch size for the suffix pass.
+
+    Returns:
+        np.ndarray: res[i] == product of all elements of L except L[i].
+
+    Time Complexity: O(N)
+    """
+    arr = np.asarray(L)
+    if arr.dtype.kind in 'iu' and len(arr) > 0:
+        # every output is a sub-product of the nonzero elements
+        magnitudes = np.abs(arr[arr != 0].astype(np.float64))
+        if np.log2(magnitudes).sum() >= np.iinfo(arr.dtype).bits - 2:
+            arr = arr.astype(object)
+    n = len(arr)
+    res = np.empty_like(arr)
+    res[0] = 1
+    np.multiply.accumulate(arr[:-1], out=res[1:])
+    suffix = 1 # product of arr[end:]
+    for end in range(n, 0, -blockSize):
+        start = max(end - blockSize, 0)
+        # block[t] = product of arr[start + t + 1:end]
+        block = np.empty(end - start, dtype=res.dtype)
+        block[-1] = 1
+        np.multiply.accumulate(arr[end - 1:start:-1], out=block[-2::-1])
+        block *= suffix
+        res[start:end] *= block
+        suffix = suffix * np.prod(arr[start:end])
+    return res
+
+def testProductExceptSelfVectorized():
+    assert(list(productExceptSelfVectorized([2, 5, 3, 1])) == [15, 6, 10, 30])
+    assert(list(productExceptSelfVectorized([2, 5, 3, 1, 10])) == [150, 60, 100, 300, 30])
+    assert(list(productExceptSelfVectorized([1, 2])) == [2, 1])
+    L = np.array([3, 6, 5, 0, 2, 1, 4])
+    for blockSize in [1, 2, 3, 100]:
+        res = productExceptSelfVectorized(L, blockSize)
+        assert(list(res) == productExceptSelf(list(L)))
+
+    # products past int64 are exact, as in productExceptSelf
+    for L in [[10**10, 10**10, 1], np.array([2**40, -2**30, 3, 0, 5]), [2**70, 3, 2]]:
+        for blockSize in [1, 2, 4096]:
+            res = productExceptSelfVectorized(L, blockSize)
+            assert(list(res) == productExceptSelf([int(x) for x in L]))
+
 # More Examples to Work Through
 # queryProducts: exactly the same logic as averagePrices
 def preprocess(L):
@@ -155,8 +744,89 @@ def preprocess(L):
     return preprocessed
 
 def getProduct(preprocessed, i, j):
+    if hasattr(preprocessed, 'product'):
+        return preprocessed.product(i, j)
     return preprocessed[j] / preprocessed[i]
 
+class RangeProduct:
+    """
+    Zero-safe range products in constant time and bounded memory.
+
+    `getProduct` divides two unbounded prefix products, which fails as soon
+    as L contains a 0 and slows down as the integers grow. Instead we keep
+    prefix counts of zeros and negatives plus a prefix sum of log|x|, so every
+    element costs a fixed 24 bytes and a query is O(1). With `modulus` (a
+    prime), exact products mod p are kept instead of logs, and multiples of p
+    are counted like zeros.
+
+    Args:
+        L (list[float]): Values to multiply, e.g. gross returns 1 + r.
+        modulus (int, optional): Prime modulus for exact modular products.
+    """
+    def __init__(self, L, modulus=None):
+        self.modulus = modulus
+        n = len(L)
+        self.zeros = np.zeros(n + 1, dtype=np.int64)
+        if modulus is None:
+            values = np.asarray(L, dtype=np.float64)
+            isZero = values == 0
+            np.cumsum(isZero, out=self.zeros[1:])
+            self.negatives = np.zeros(n + 1, dtype=np.int64)
+            np.cumsum(values < 0, out=self.negatives[1:])
+            self.logs = np.zeros(n + 1, dtype=np.float64)
+            self.logs[1:] = compensatedCumsum(np.log(np.abs(np.where(isZero, 1.0, values))))
+        else:
+            self.preprocessed = [1] * (n + 1)
+            for i in range(n):
+                elem = L[i] % modulus
+                self.zeros[i + 1] = self.zeros[i] + (elem == 0)
+                self.preprocessed[i + 1] = self.preprocessed[i] * (elem or 1) % modulus
+
+    def __len__(self):
+        return len(self.zeros) - 1
+
+    def logProduct(self, i, j):
+        """
+        Return (sign, log|product|) of L[i:j]; sign is 0 if the range has a 0.
+        Only available in float mode.
+        """
+        if self.modulus is not None:
+            raise ValueError('logProduct is not defined with a modulus')
+        if self.zeros[j] > self.zeros[i]:
+            return 0, float('-inf')
+        sign = -1 if (self.negatives[j] - self.negatives[i]) % 2 else 1
+        return sign, float(self.logs[j] - self.logs[i])
+
+    def product(self, i, j):
+        """
+        Return the product of L[i:j]. Time Complexity: O(1)
+
+        Raises OverflowError if the product does not fit in a float; use
+        `logProduct` for very long compounding windows.
+        """
+        if self.modulus is not None:
+            if self.zeros[j] > self.zeros[i]:
+                return 0
+            inverse = pow(self.preprocessed[i], -1, self.modulus)
+            return self.preprocessed[j] * inverse % self.modulus
+        sign, logAbs = self.logProduct(i, j)
+        return sign * math.exp(logAbs) if sign != 0 else 0.0
+
+    def products(self, starts, ends):
+        """
+        Return the product of every range [starts[k], ends[k]) (float mode).
+
+        Time Complexity: O(Q), vectorized over the Q queries.
+        """
+        if self.modulus is not None:
+            raise ValueError('products is float mode only; use product with a modulus')
+        starts = np.asarray(starts, dtype=np.intp)
+        ends = np.asarray(ends, dtype=np.intp)
+        signs = 1 - 2 * ((self.negatives[ends] - self.negatives[starts]) % 2)
+        res = signs * np.exp(self.logs[ends] - self.logs[starts])
+        res[self.zeros[ends] > self.zeros[starts]] = 0.0
+        return res
+
 def testQueryProducts():
     L = [4, 2, 1, 8, 3, 5, 2]
     preprocessed = preprocess(L)
@@ -174,6 +844,237 @@ def testQueryProducts():
     assert(getProduct(preprocessed, 1, 5) == 48)
     assert(getProduct(preprocessed, 3, 4) == 8)
 
+def testRangeProduct():
+    L = [4, 2, 1, 8, 3, 5, 2]
+    products = RangeProduct(L)
+    assert(almostEqual(getProduct(products, 0, 7), 1920))
+    assert(almostEqual(getProduct(products, 2, 6), 120))
+    assert(almostEqual(getProduct(products, 3, 4), 8))
+    res = products.products([0, 5, 1], [7, 7, 5])
+    assert(all(almostEqual(x, y) for x, y in zip(res, [1920, 10, 48])))
+
+    L = [3, -2, 0, 5, -1, 4]
+    products = RangeProduct(L)
+    assert(almostEqual(getProduct(products, 0, 2), -6))
+    assert(almostEqual(getProduct(products, 1, 4), 0))
+    assert(almostEqual(getProduct(products, 3, 6), -20))
+    assert(products.logProduct(2, 3) == (0, float('-inf')))
+    res = products.products([0, 1, 3], [2, 4, 6])
+    assert(all(almostEqual(x, y) for x, y in zip(res, [-6, 0, -20])))
+
+    # long compounding windows stay finite in log space
+    returns = RangeProduct([1.001] * 1000000)
+    sign, logAbs = returns.logProduct(0, 1000000)
+    assert(sign == 1 and almostEqual(logAbs, 1000000 * math.log(1.001), 1e-4))
+
+    p = 10**9 + 7
+    products = RangeProduct([4, 2, 0, p, 3, 10**12], modulus=p)
+    assert(products.product(0, 2) == 8)
+    assert(products.product(1, 4) == 0)
+    assert(products.product(4, 6) == 3 * 10**12 % p)
+    for query in [lambda: products.logProduct(0, 2), lambda: products.products([0], [2])]:
+        try:
+            query()
+            assert(False)
+        except ValueError:
+            pass
+
+# Mutable ranges: when a historical value is corrected, the prefix arrays
+# above need an O(N) rebuild. These trees trade O(1) queries for O(log N)
+# queries and O(log N) point updates, with the same [i, j) contract.
+class FenwickTree:
+    """
+    Binary indexed tree of range sums over a mutable list of values.
+    """
+    def __init__(self, values):
+        self.values = list(values)
+        n = len(self.values)
+        self.tree = [0] * (n + 1)
+        for i in range(n):
+            self.tree[i + 1] += self.values[i]
+            parent = (i + 1) + ((i + 1) & -(i + 1))
+            if parent <= n:
+                self.tree[parent] += self.tree[i + 1]
+
+    def __len__(self):
+        return len(self.values)
+
+    def _prefixSum(self, i):
+        res = 0
+        while i > 0:
+            res += self.tree[i]
+            i -= i & -i
+        return res
+
+    def update(self, i, value):
+        """
+        Set values[i] = value. Time Complexity: O(log N)
+        """
+        delta = value - self.values[i]
+        self.values[i] = value
+        i += 1
+        while i < len(self.tree):
+            self.tree[i] += delta
+            i += i & -i
+
+    def query(self, i, j):
+        """
+        Return the sum of values in [i, j). Time Complexity: O(log N)
+        """
+        return self._prefixSum(j) - self._prefixSum(i)
+
+    def average(self, i, j):
+        return self.query(i, j) / (j - i)
+
+class SegmentTree:
+    """
+    Iterative segment tree for any associative operation (min, max, product).
+
+    Args:
+        values (list): Initial values.
+        combine (function): Associative binary operation, e.g. `min`.
+        identity: Value x with combine(x, y) == y for every y.
+    """
+    def __init__(self, values, combine, identity):
+        self.n = len(values)
+        self.combine = combine
+        self.identity = identity
+        self.tree = [identity] * self.n + list(values)
+        for i in range(self.n - 1, 0, -1):
+            self.tree[i] = combine(self.tree[2 * i], self.tree[2 * i + 1])
+
+    def __len__(self):
+        return self.n
+
+    def update(self, i, value):
+        """
+        Set values[i] = value. Time Complexity: O(log N)
+        """
+        i += self.n
+        self.tree[i] = value
+        while i > 1:
+            i //= 2
+            self.tree[i] = self.combine(self.tree[2 * i], self.tree[2 * i + 1])
+
+    def query(self, i, j):
+        """
+        Combine values in [i, j) in order. Time Complexity: O(log N)
+        """
+        left = right = self.identity
+        i += self.n
+        j += self.n
+        while i < j:
+            if i & 1:
+                left = self.combine(left, self.tree[i])
+                i += 1
+            if j & 1:
+                j -= 1
+                right = self.combine(self.tree[j], right)
+            i //= 2
+            j //= 2
+        return self.combine(left, right)
+
+def minSegmentTree(values):
+    return SegmentTree(values, min, float('inf'))
+
+def maxSegmentTree(values):
+    return SegmentTree(values, max, float('-inf'))
+
+def productSegmentTree(values):
+    return SegmentTree(values, lambda x, y: x * y, 1)
+
+def testRangeTrees():
+    prices = [3.0, 4.5, 3.6, 3.1, 2.7, 4.8, 5.1]
+    sums = FenwickTree(prices)
+    assert(almostEqual(getAverage(sums, 0, 7), 3.8285714))
+    assert(almostEqual(getAverage(sums, 2, 5), 3.1333333))
+    sums.update(3, 4.1) # correct a historical price
+    assert(almostEqual(getAverage(sums, 2, 5), 3.4666667))
+    assert(almostEqual(sums.query(0, 7), 26.8 + 1.0))
+    assert(sums.query(4, 4) == 0)
+
+    L = [4, 2, 1, 8, 3, 5, 2]
+    products = productSegmentTree(L)
+    assert(products.query(0, 7) == 1920)
+    assert(products.query(2, 6) == 120)
+    products.update(2, 0) # zeros are fine, unlike getProduct
+    assert(products.query(0, 7) == 0)
+    assert(products.query(3, 7) == 240)
+
+    mins, maxes = minSegmentTree(L), maxSegmentTree(L)
+    assert(mins.query(0, 7) == 1 and maxes.query(0, 7) == 8)
+    assert(mins.query(3, 6) == 3 and maxes.query(4, 7) == 5)
+    mins.update(4, -1)
+    maxes.update(4, 9)
+    assert(mins.query(3, 6) == -1 and maxes.query(4, 7) == 9)
+    assert(mins.query(5, 5) == float('inf'))
+
+# Static min/max windows: a sparse table answers them in O(1) after an
+# O(N log N) build, where the prefix sums above only handle sums.
+class SparseTable:
+    """
+    Sparse table for idempotent range queries such as min and max.
+
+    table[k][i] combines values[i:i + 2**k]; any [i, j) is covered by two
+    overlapping power-of-two blocks, so a query is two lookups.
+
+    Args:
+        values (array-like[float]): Values to query.
+        combine (np.ufunc): Idempotent binary ufunc, e.g. np.minimum.
+    """
+    def __init__(self, values, combine):
+        values = np.asarray(values, dtype=np.float64)
+        n = len(values)
+        self.combine = combine
+        self.log = np.zeros(n + 1, dtype=np.intp) # log[m] == floor(log2(m))
+        for m in range(2, n + 1):
+            self.log[m] = self.log[m // 2] + 1
+        self.table = np.empty((int(self.log[n]) + 1 if n else 1, n), dtype=np.float64)
+        self.table[0] = values
+        for k in range(1, len(self.table)):
+            half = 1 << (k - 1)
+            width = n - (1 << k) + 1
+            combine(self.table[k - 1, :width], self.table[k - 1, half:half + width],
+                    out=self.table[k, :width])
+
+    def __len__(self):
+        return self.table.shape[1]
+
+    def query(self, i, j):
+        """
+        Combine values in [i, j), with i < j. Time Complexity: O(1)
+        """
+        k = self.log[j - i]
+        return float(self.combine(self.table[k, i], self.table[k, j - (1 << k)]))
+
+    def queries(self, starts, ends):
+        """
+        Answer every range [starts[q], ends[q]) in one vectorized call.
+        """
+        starts = np.asarray(starts, dtype=np.intp)
+        ends = np.asarray(ends, dtype=np.intp)
+        ks = self.log[ends - starts]
+        return self.combine(self.table[ks, starts], self.table[ks, ends - (1 << ks)])
+
+def minSparseTable(values):
+    return SparseTable(values, np.minimum)
+
+def maxSparseTable(values):
+    return SparseTable(values, np.maximum)
+
+def testSparseTable():
+    prices = [3.0, 4.5, 3.6, 3.1, 2.7, 4.8, 5.1]
+    mins, maxes = minSparseTable(prices), maxSparseTable(prices)
+    assert(len(mins) == 7)
+    for i in range(7):
+        for j in range(i + 1, 8):
+            assert(mins.query(i, j) == min(prices[i:j]))
+            assert(maxes.query(i, j) == max(prices[i:j]))
+    starts, ends = [0, 2, 4, 6], [7, 5, 6, 7]
+    assert(list(mins.queries(starts, ends)) == [2.7, 2.7, 2.7, 5.1])
+    assert(list(maxes.queries(starts, ends)) == [5.1, 3.6, 4.8, 5.1])
+    assert(len(minSparseTable([])) == 0)
+
 # balanceIndex: logic exactly the same as productExceptSelf
 def balanceIndex(L):
     n = len(L)
@@ -190,6 +1091,28 @@ def balanceIndex(L):
             return i
     return None
 
+def balanceIndexVectorized(L):
+    """
+    NumPy version of `balanceIndex` using a single cumulative sum.
+
+    With inclusive prefix sums c, the sum left of i is c[i] - L[i] and the
+    sum right of i is total - c[i], so i balances exactly when
+    2 * c[i] - L[i] == total; the first such i is found with one comparison
+    over the whole array.
+
+    Returns:
+        int | None: The first balance index, or None if there is none.
+
+    Time Complexity: O(N)
+    """
+    arr = np.asarray(L)
+    if len(arr) == 0:
+        return None
+    preprocessed = np.cumsum(arr)
+    isBalanced = 2 * preprocessed - arr == preprocessed[-1]
+    i = int(np.argmax(isBalanced))
+    return i if isBalanced[i] else None
+
 def testBalanceIndex():
     assert(balanceIndex([3, 5, 1, 4, 2, 2]) == 2)   # 3 + 5 == 4 + 2 + 2
     assert(balanceIndex([1, -3, 2, 1]) == 0)        # 0 == -3 + 2 + 1
@@ -203,6 +1126,11 @@ def testBalanceIndex():
     assert(balanceIndex([3, 3]) == None)
     assert(balanceIndex([]) == None)
 
+    for L in [[3, 5, 1, 4, 2, 2], [1, -3, 2, 1], [5, -3, -2, 1], [0, 0, 0],
+              [5], [2, -2, 1, 2], [3, 3], []]:
+        assert(balanceIndexVectorized(L) == balanceIndex(L))
+    assert(balanceIndexVectorized(np.array([1, 0, 1])) == 1)
+
 ################################################################################
 # Data Structure: Stacks -- FILO
 
@@ -222,6 +1150,98 @@ def testBalanceIndex():
 # Space Complexity: O(N)
 ################################################################################
 
+class MonotonicStack:
+    """
+    Monotonic stack of (value, position) pairs, the engine behind
+    nextGreaterElement, dailyTemperatures, stockSpan and RangeBounds.
+
+    Positions live in an `array('q')` (8 bytes each) and values in a list of
+    references to the caller's objects (8 bytes each), so a resident stack
+    costs ~16 bytes per element and any comparable values (strings, tuples)
+    work. `resolve` runs a whole sequence through the stack in one call;
+    `push` feeds one value at a time for the online classes.
+
+    Args:
+        decreasing (bool): Keep values decreasing from bottom to top (used to
+            find the next greater element) or increasing (next smaller).
+        strict (bool): Pop only when the new value is strictly greater
+            (decreasing) / strictly smaller (increasing) than the top. With
+            strict=False, equal values are popped too.
+        typecode (str, optional): `array` typecode to store the values in a
+            typed array too, e.g. 'q' for int64 values.
+    """
+    def __init__(self, decreasing=True, strict=True, typecode=None):
+        self.values = [] if typecode is None else array.array(typecode)
+        self.positions = array.array('q')
+        if decreasing:
+            self.violates = operator.gt if strict else operator.ge
+        else:
+            self.violates = operator.lt if strict else operator.le
+
+    def __len__(self):
+        return len(self.positions)
+
+    def isEmpty(self):
+        return len(self.positions) == 0
+
+    def peek(self):
+        return self.values[-1], self.positions[-1]
+
+    def push(self, value, pos):
+        """
+        Pop every element the new value violates, then push (value, pos).
+
+        Returns:
+            list[int]: Positions popped, top of the stack first.
+
+        Time Complexity: O(1) amortized
+        """
+        values, positions, violates = self.values, self.positions, self.violates
+        popped = []
+        while len(values) > 0 and violates(value, values[-1]):
+            values.pop()
+            popped.append(positions.pop())
+        values.append(value)
+        positions.append(pos)
+        return popped
+
+    def resolve(self, values, previous=False):
+        """
+        Push values[0], values[1], ... (positions 0..n-1) onto an empty stack.
+
+        The pass keeps the stack in local lists, which push and pop without
+        converting machine integers to Python ints and back, and leaves the
+        unresolved elements in the stack's own arrays at the end.
+
+        Returns:
+            tuple: (nextPos, prevPos), array('q')s of length n. nextPos[i]
+            is the position whose push popped i (n if it never was);
+            prevPos[i] is the position right below i after its push (-1 if
+            none), or prevPos is None unless previous=True. On a strict
+            decreasing stack these are the next greater and the previous
+            greater-or-equal elements.
+
+        Time Complexity: O(N)
+        """
+        if len(self.positions) > 0:
+            raise ValueError('resolve needs an empty stack')
+        n = len(values)
+        nextPos = array.array('q', [n]) * n
+        prevPos = array.array('q', [-1]) * n if previous else None
+        violates = self.violates
+        stackValues, positions = [], [-1] # -1 sits below the bottom value
+        for pos, value in enumerate(values):
+            while stackValues and violates(value, stackValues[-1]):
+                stackValues.pop()
+                nextPos[positions.pop()] = pos
+            if previous:
+                prevPos[pos] = positions[-1]
+            stackValues.append(value)
+            positions.append(pos)
+        self.values.extend(stackValues)
+        self.positions.extend(positions[1:])
+        return nextPos, prevPos
+
 # Example: nextGreaterElement
 def nextGreaterElement(L):
     """
@@ -240,15 +1260,10 @@ def nextGreaterElement(L):
 
     Time Complexity: O(N) — each element is pushed and popped at most once.
     """
-    res = [-1] * len(L)
     # monotonic decreasing stack (elem, pos)
-    stack = []
-    for currPos, currElem in enumerate(L):
-        while stack != [] and L[currPos] > stack[-1][0]:
-            prev, prevPos = stack.pop()
-            res[prevPos] = currElem
-        stack.append((currElem, currPos))
-    return res
+    nextPos, _ = MonotonicStack(decreasing=True, strict=True).resolve(L)
+    answers = list(L) + [-1] # position n means no greater element
+    return list(map(answers.__getitem__, nextPos))
 
 def testNextGreaterElement():
     assert(nextGreaterElement([8, 5, 8, 12, 15]) == [12, 8, 12, 15, -1])
@@ -260,6 +1275,41 @@ def testNextGreaterElement():
     assert(nextGreaterElement([3, 3, 3, 3]) == [-1, -1, -1, -1])
     assert(nextGreaterElement([5]) == [-1])
     assert(nextGreaterElement([]) == [])
+    assert(nextGreaterElement(['b', 'a', 'c']) == ['c', 'c', -1])
+
+def testMonotonicStack():
+    stack = MonotonicStack(decreasing=True, strict=True)
+    assert(stack.push(5, 0) == [] and stack.push(3, 1) == [] and stack.push(3, 2) == [])
+    assert(stack.push(4, 3) == [2, 1])
+    assert(len(stack) == 2 and stack.peek() == (4, 3))
+
+    stack = MonotonicStack(decreasing=True, strict=False)
+    stack.push(3, 0)
+    assert(stack.push(3, 1) == [0])
+
+    stack = MonotonicStack(decreasing=False, strict=True, typecode='q')
+    for pos, value in enumerate([1, 4, 6]):
+        stack.push(value, pos)
+    assert(stack.push(4, 3) == [2])
+    assert(stack.push(0, 4) == [3, 1, 0])
+    assert(stack.isEmpty() == False and stack.peek() == (0, 4))
+
+    stack = MonotonicStack(decreasing=True, strict=True)
+    for pos, value in enumerate(['b', 'a']):
+        stack.push(value, pos)
+    assert(stack.push('c', 2) == [1, 0] and stack.peek() == ('c', 2))
+
+    stack = MonotonicStack(decreasing=True, strict=True)
+    nextPos, prevPos = stack.resolve([5, 3, 3, 4, 6], previous=True)
+    assert(list(nextPos) == [4, 3, 3, 4, 5] and list(prevPos) == [-1, 0, 1, 0, -1])
+    assert(stack.peek() == (6, 4) and len(stack) == 1) # unresolved elements stay
+    try:
+        stack.resolve([1])
+        assert(False)
+    except ValueError:
+        pass
+    assert([list(res) for res in MonotonicStack().resolve([], previous=True)] == [[], []])
+    assert(MonotonicStack().resolve([3, 1])[1] is None)
 
 # Example: dailyTemperatures
 def dailyTemperatures(temperatures):
@@ -280,20 +1330,89 @@ def dailyTemperatures(temperatures):
 
     Time Complexity: O(N).
     """
-    res = [0] * len(temperatures)
-    stack = [] # (temp, pos) pair
-    for currPos, currTemp in enumerate(temperatures):
-        while stack != [] and currTemp > stack[-1][0]:
-            prevTemp, prevPos = stack.pop()
-            res[prevPos] = currPos - prevPos
-        stack.append((currTemp, currPos))
-    return res
+    # monotonic decreasing stack (temp, pos)
+    nextPos, _ = MonotonicStack(decreasing=True, strict=True).resolve(temperatures)
+    warmer = np.frombuffer(nextPos, dtype=np.int64)
+    waits = warmer - np.arange(len(warmer))
+    waits[warmer == len(warmer)] = 0
+    return waits.tolist()
 
 def testDailyTemperatures():
     assert(dailyTemperatures([73,74,75,71,69,72,76,73]) == [1,1,4,2,1,1,0,0])
     assert(dailyTemperatures([30,40,50,60]) == [1,1,1,0])
     assert(dailyTemperatures([30,60,90]) == [1,1,0])
 
+# Online version of nextGreaterElement / dailyTemperatures
+class NextGreaterStream:
+    """
+    Monotonic decreasing stack fed one value at a time.
+
+    `push` returns the (index, answer) pairs resolved by the new value as
+    soon as they are known, so a live feed is processed without holding the
+    whole series. The answer is the next greater value, or, with
+    distance=True, how many steps later it came (as in dailyTemperatures).
+    """
+    def __init__(self, distance=False):
+        self.distance = distance
+        self.stack = MonotonicStack(decreasing=True, strict=True)
+        self.n = 0
+
+    def push(self, value):
+        """
+        Consume one value and return the newly resolved (index, answer) pairs.
+
+        Time Complexity: O(1) amortized
+        """
+        currPos = self.n
+        self.n += 1
+        return [(prevPos, currPos - prevPos if self.distance else value)
+                for prevPos in self.stack.push(value, currPos)]
+
+    def flush(self):
+        """
+        End the stream: resolve every pending index with -1 (or 0 for
+        distances), in index order.
+        """
+        default = 0 if self.distance else -1
+        resolved = [(pos, default) for pos in self.stack.positions]
+        self.stack = MonotonicStack(decreasing=True, strict=True)
+        return resolved
+
+def nextGreaterElementStream(values, distance=False):
+    """
+    Generator over an iterable of values yielding (index, answer) pairs the
+    moment each index is resolved; pending indices are flushed at the end.
+    """
+    stream = NextGreaterStream(distance)
+    for value in values:
+        yield from stream.push(value)
+    yield from stream.flush()
+
+def dailyTemperaturesStream(temperatures):
+    return nextGreaterElementStream(temperatures, distance=True)
+
+def testNextGreaterElementStream():
+    for L in [[8, 5, 8, 12, 15], [4, 7, 2, 7, 1, 9], [6, 2, 7, 1, 5],
+              [5, 4, 3, 2, 1], [3, 3, 3, 3], [5], []]:
+        res = [None] * len(L)
+        for i, answer in nextGreaterElementStream(iter(L)):
+            res[i] = answer
+        assert(res == nextGreaterElement(L))
+
+    temperatures = [73,74,75,71,69,72,76,73]
+    res = [None] * len(temperatures)
+    for i, answer in dailyTemperaturesStream(temperatures):
+        res[i] = answer
+    assert(res == dailyTemperatures(temperatures))
+
+    # answers are emitted as soon as they are known
+    stream = NextGreaterStream()
+    assert(stream.push(5) == [])
+    assert(stream.push(3) == [])
+    assert(stream.push(4) == [(1, 4)])
+    assert(stream.push(9) == [(2, 9), (0, 9)])
+    assert(stream.flush() == [(3, -1)])
+
 # Example: stockSpan
 def stockSpan(prices):
     """
@@ -326,15 +1445,12 @@ def stockSpan(prices):
 
     Time Complexity: O(N) — each index is pushed and popped from the stack at most once.
     """
-    stack = [] # (price, pos) monotonic decreasing
-    res = [1] * (len(prices))
-    
-    for currPos, currPrice in enumerate(prices):
-        while stack != [] and currPrice >= stack[-1][0]:
-            prevPrice, prevPos = stack.pop()
-            res[currPos] = res[currPos] + res[prevPos]
-        stack.append((currPrice, currPos))
-    return res
+    # The span ends at the last earlier day with a strictly higher price,
+    # which is the next strictly higher day of the reversed series: one
+    # (price, pos) monotonic decreasing stack over prices[::-1].
+    nextPos, _ = MonotonicStack(decreasing=True, strict=True).resolve(prices[::-1])
+    higher = len(nextPos) - 1 - np.frombuffer(nextPos, dtype=np.int64)[::-1]
+    return (np.arange(len(higher)) - higher).tolist()
 
 def testStockSpan():
     # assert(stockSpan([100, 80, 60, 70, 60, 75, 85]) == [1, 1, 1, 2, 1, 4, 6])
@@ -346,12 +1462,325 @@ def testStockSpan():
     assert(stockSpan([5]) == [1])
     assert(stockSpan([]) == [])
 
+class StockSpanner:
+    """
+    Incremental stockSpan: `next(price)` returns today's span in O(1)
+    amortized time, keeping the monotonic stack between calls.
+
+    The stack can be written to disk with `snapshot` and read back with
+    `restore`, so a daily job only has to process the new bar.
+    """
+    def __init__(self):
+        # (price, day) monotonic decreasing, equal prices are popped too;
+        # prices stay Python numbers so large ints compare exactly
+        self.stack = MonotonicStack(decreasing=True, strict=False)
+        self.n = 0 # number of days seen
+
+    def next(self, price):
+        """
+        Add one day's price and return its span. Time Complexity: O(1) amortized
+        """
+        currPos = self.n
+        self.n += 1
+        self.stack.push(price, currPos)
+        if len(self.stack) == 1:
+            return currPos + 1
+        return currPos - self.stack.positions[-2]
+
+    def snapshot(self, path):
+        """
+        Save the stack and day count to path (NumPy .npz format). Prices keep
+        their dtype (int64 or float64); ints outside int64 are written as
+        decimal strings.
+        """
+        values = np.array(self.stack.values)
+        if values.dtype == object:
+            values = values.astype(str)
+        with open(path, 'wb') as f:
+            np.savez(f, values=values,
+                     positions=np.frombuffer(self.stack.positions, dtype=np.int64),
+                     n=self.n)
+
+    def restore(self, path):
+        """
+        Replace the current state with the one saved by `snapshot`.
+        """
+        with np.load(path) as data:
+            values = data['values']
+            self.stack = MonotonicStack(decreasing=True, strict=False)
+            self.stack.values.extend(map(int, values) if values.dtype.kind == 'U'
+                                     else values.tolist())
+            self.stack.positions.frombytes(data['positions'].tobytes())
+            self.n = int(data['n'])
+
+def testStockSpanner():
+    prices = [100, 80, 60, 70, 60, 75, 85, 85, 20]
+    spanner = StockSpanner()
+    assert([spanner.next(price) for price in prices] == stockSpan(prices))
+
+    spanner = StockSpanner()
+    for price in prices[:5]:
+        spanner.next(price)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'spanner.npz')
+        spanner.snapshot(path)
+        restored = StockSpanner()
+        restored.restore(path)
+    assert([restored.next(price) for price in prices[5:]] == stockSpan(prices)[5:])
+
+    # above 2**53 the prices do not fit a float64 exactly
+    for prices in ([2**53 + 1, 2**53], [2**70, 2**53 + 1, 2**53, 5]):
+        spanner = StockSpanner()
+        spanner.next(prices[0])
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'spanner.npz')
+            spanner.snapshot(path)
+            restored = StockSpanner()
+            restored.restore(path)
+        assert([restored.next(price) for price in prices[1:]] == stockSpan(prices)[1:])
+        spanner = StockSpanner()
+        assert([spanner.next(price) for price in prices] == stockSpan(prices))
+
+def stockSpanFlat(seriesList):
+    """
+    Worker step of `stockSpanBatch`: spans of every series, concatenated
+    into one int32 array. Array rows are converted to Python floats one at
+    a time, so only a single row is ever held as Python objects.
+    """
+    res = np.ones(sum(len(prices) for prices in seriesList), dtype=np.int32)
+    start = 0
+    for prices in seriesList:
+        if isinstance(prices, np.ndarray):
+            prices = prices.tolist()
+        res[start:start + len(prices)] = stockSpan(prices)
+        start += len(prices)
+    return res
+
+def stockSpanBatch(seriesList, numWorkers=None, parallelThreshold=10**6):
+    """
+    Compute stockSpan for many tickers at once.
+
+    Each ticker still runs through `stockSpan` on its own (a per-row loop,
+    also for 2-D input); the batch adds one shared output buffer and the
+    process pool.
+
+    Args:
+        seriesList (list[list[float]] | np.ndarray): Ragged list of price
+            series, or a 2-D array with one row per ticker.
+        numWorkers (int, optional): Number of processes to use once the
+            batch holds more than parallelThreshold prices. Defaults to the
+            number of CPUs. Tickers are split into contiguous groups of
+            similar total length.
+        parallelThreshold (int): Smaller batches run in this process.
+
+    Returns:
+        np.ndarray | list[np.ndarray]: For 2-D input, a 2-D int32 array of
+        spans. Otherwise one int32 array per ticker, all views into a single
+        contiguous buffer.
+
+    Time Complexity: O(total number of prices)
+    """
+    numWorkers = numWorkers or os.cpu_count() or 1
+    isMatrix = isinstance(seriesList, np.ndarray)
+    if isMatrix:
+        shape = seriesList.shape
+    lengths = [len(prices) for prices in seriesList]
+    total = sum(lengths)
+
+    if numWorkers > 1 and total > parallelThreshold:
+        groups, group, groupSize = [], [], 0
+        for prices in seriesList:
+            group.append(prices)
+            groupSize += len(prices)
+            if groupSize >= total / numWorkers:
+                groups.append(group)
+                group, groupSize = [], 0
+        if group != []:
+            groups.append(group)
+        with multiprocessing.Pool(numWorkers) as pool:
+            spans = np.concatenate(pool.map(stockSpanFlat, groups))
+    else:
+        spans = stockSpanFlat(seriesList)
+
+    if isMatrix:
+        return spans.reshape(shape)
+    offsets = np.cumsum([0] + lengths)
+    return [spans[offsets[i]:offsets[i + 1]] for i in range(len(lengths))]
+
+def testStockSpanBatch():
+    seriesList = [[20, 20, 15, 40, 40, 35, 50], [9, 7, 5, 3, 1], [], [5],
+                  [70, 70, 85, 30, 30, 55, 95]]
+    expected = [stockSpan(prices) for prices in seriesList]
+    res = stockSpanBatch(seriesList)
+    assert([list(spans) for spans in res] == expected)
+    res = stockSpanBatch(seriesList, numWorkers=2, parallelThreshold=0)
+    assert([list(spans) for spans in res] == expected)
+
+    matrix = np.array([[1, 2, 3, 4, 5], [10, 10, 10, 1, 11]])
+    res = stockSpanBatch(matrix)
+    assert(res.dtype == np.int32 and res.shape == (2, 5))
+    assert(res.tolist() == [[1, 2, 3, 4, 5], [1, 2, 3, 1, 5]])
+    res = stockSpanBatch(matrix, numWorkers=2, parallelThreshold=0)
+    assert(res.tolist() == [[1, 2, 3, 4, 5], [1, 2, 3, 1, 5]])
+
+# Example: nearest greater / smaller indices, all four in one traversal
+class RangeBounds:
+    """
+    Previous/next greater and smaller indices of every element of L.
+
+    A decreasing and an increasing MonotonicStack each resolve L once. When
+    an element is popped, the current index is its next greater (or smaller)
+    index; after the pops, the element under the new top is the current
+    index's previous one.
+
+    Attributes (np.ndarray[int64]):
+        nextGreater[i]: first j > i with L[j] > L[i], or n.
+        prevGreater[i]: last j < i with L[j] >= L[i], or -1.
+        nextSmaller[i]: first j > i with L[j] < L[i], or n.
+        prevSmaller[i]: last j < i with L[j] <= L[i], or -1.
+
+    Time Complexity: O(N) build; the queries below are O(N) vectorized.
+    """
+    def __init__(self, L):
+        self.L = np.asarray(L, dtype=np.float64)
+        nextGreater, prevGreater = MonotonicStack(decreasing=True, strict=True).resolve(L, True)
+        nextSmaller, prevSmaller = MonotonicStack(decreasing=False, strict=True).resolve(L, True)
+        # the int64 arrays are wrapped without copying
+        self.nextGreater = np.frombuffer(nextGreater, dtype=np.int64)
+        self.prevGreater = np.frombuffer(prevGreater, dtype=np.int64)
+        self.nextSmaller = np.frombuffer(nextSmaller, dtype=np.int64)
+        self.prevSmaller = np.frombuffer(prevSmaller, dtype=np.int64)
+
+    def largestRectangle(self):
+        """
+        Treat L as histogram heights and return (area, i, j) of the largest
+        rectangle, which spans bars [i, j). Returns (0, 0, 0) for empty L.
+        """
+        if len(self.L) == 0:
+            return 0, 0, 0
+        widths = self.nextSmaller - self.prevSmaller - 1
+        best = int(np.argmax(self.L * widths))
+        return float(self.L[best] * widths[best]), int(self.prevSmaller[best] + 1), int(self.nextSmaller[best])
+
+    def maxDrawdown(self):
+        """
+        Return (drawdown, peak, trough): the largest drop L[peak] - L[trough]
+        with peak <= trough. Returns (0, 0, 0) for empty L.
+        """
+        if len(self.L) == 0:
+            return 0.0, 0, 0
+        drawdowns = np.maximum.accumulate(self.L) - self.L
+        trough = int(np.argmax(drawdowns))
+        peak = int(np.argmax(self.L[:trough + 1]))
+        return float(drawdowns[trough]), peak, trough
+
+    def longestDrawdown(self):
+        """
+        Return (peak, recovery): the longest stretch [peak, recovery) before
+        the price first exceeds L[peak]; recovery == n if it never does.
+        """
+        if len(self.L) == 0:
+            return 0, 0
+        peak = int(np.argmax(self.nextGreater - np.arange(len(self.L))))
+        return peak, int(self.nextGreater[peak])
+
+def testRangeBounds():
+    L = [3, 1, 4, 1, 5, 9, 2, 6]
+    bounds = RangeBounds(L)
+    n = len(L)
+    for i in range(n):
+        after = [j for j in range(i + 1, n) if L[j] > L[i]]
+        assert(bounds.nextGreater[i] == (after[0] if after else n))
+        before = [j for j in range(i) if L[j] >= L[i]]
+        assert(bounds.prevGreater[i] == (before[-1] if before else -1))
+        after = [j for j in range(i + 1, n) if L[j] < L[i]]
+        assert(bounds.nextSmaller[i] == (after[0] if after else n))
+        before = [j for j in range(i) if L[j] <= L[i]]
+        assert(bounds.prevSmaller[i] == (before[-1] if before else -1))
+
+    assert(RangeBounds([2, 1, 5, 6, 2, 3]).largestRectangle() == (10, 2, 4))
+    assert(RangeBounds([2, 2, 2]).largestRectangle() == (6, 0, 3))
+    assert(RangeBounds([]).largestRectangle() == (0, 0, 0))
+
+    prices = [100, 120, 90, 110, 80, 130, 125]
+    bounds = RangeBounds(prices)
+    assert(bounds.maxDrawdown() == (40, 1, 4))
+    assert(bounds.longestDrawdown() == (1, 5))
+    assert(RangeBounds([5, 4, 3]).longestDrawdown() == (0, 3))
+
 ################################################################################
 # Data Structure: Min/Max Heap
 
 # Algorithm Name: kSmallest / kLargest
 ################################################################################
-def findKthLargest(nums, k):
+def findKthLargest(nums, k, strategy='auto'):
+    """
+    Return the k-th largest element of nums (k = 1 is the maximum).
+
+    Strategies:
+        'heap': size-k min-heap, O(N log k); best when k is tiny.
+        'numpy': np.argpartition, O(N) in C; best for numeric data.
+        'introselect': quickselect with a median-of-medians fallback,
+            O(N) worst case; works on any comparable values.
+        'auto': numeric NumPy arrays use 'numpy'; otherwise 'heap' when k
+            is at most 1% of N (or 16), 'numpy' when the values convert to
+            an int/float array exactly and 'introselect' for anything else.
+
+    nums may be any iterable (a set, a generator); anything other than a
+    list, tuple or NumPy array is read into a list first. The result is
+    the element of nums itself (so ints stay ints in a mixed list), as a
+    Python scalar, never a NumPy one. Raises ValueError unless
+    1 <= k <= len(nums).
+    """
+    if not isinstance(nums, (list, tuple, np.ndarray)):
+        nums = list(nums)
+    if not 1 <= k <= len(nums):
+        raise ValueError(f'k must be between 1 and {len(nums)}, got {k}')
+    if strategy == 'auto':
+        strategy = chooseSelectStrategy(nums, k)
+    if strategy == 'heap':
+        return pythonScalar(findKthLargestHeap(nums, k))
+    elif strategy == 'numpy':
+        arr = selectionArray(nums)
+        index = len(arr) - k
+        return pythonScalar(nums[np.argpartition(arr, index)[index]])
+    elif strategy == 'introselect':
+        return pythonScalar(introselect(nums, len(nums) - k))
+    raise ValueError(f'unknown strategy: {strategy}')
+
+def chooseSelectStrategy(nums, k):
+    if isinstance(nums, np.ndarray) and nums.dtype.kind in 'iuf':
+        return 'numpy'
+    if k <= max(16, len(nums) // 100):
+        return 'heap'
+    if selectionArray(nums).dtype.kind in 'iuf':
+        return 'numpy'
+    return 'introselect'
+
+def selectionArray(nums):
+    """
+    Return nums as a 1-D array that NumPy orders exactly like the Python
+    values: an int/float array when every value survives the conversion,
+    otherwise dtype=object (Python comparisons, nothing converted). So
+    ints past int64, or ints past 2**53 next to floats, are never rounded.
+    """
+    if isinstance(nums, np.ndarray):
+        return nums
+    try:
+        arr = np.asarray(nums)
+    except ValueError: # ragged nested sequences
+        arr = None
+    if arr is not None and arr.ndim == 1 and arr.dtype.kind in 'iuf' \
+            and arr.tolist() == list(nums):
+        return arr
+    arr = np.empty(len(nums), dtype=object)
+    arr[:] = nums
+    return arr
+
+def pythonScalar(x):
+    return x.item() if isinstance(x, np.generic) else x
+
+def findKthLargestHeap(nums, k):
     minHeap = []
     for num in nums:
         heapq.heappush(minHeap, num)
@@ -359,14 +1788,110 @@ def findKthLargest(nums, k):
             heapq.heappop(minHeap)
     return minHeap[0]
 
+def introselect(nums, index):
+    """
+    Return the element at position `index` of sorted(nums), without sorting.
+
+    Quickselect with a median-of-three pivot and a three-way split (so runs
+    of duplicates cost nothing). If it has not converged after
+    2 * log2(N) rounds, pivots switch to the median of medians, which keeps
+    the worst case O(N).
+    """
+    L = list(nums)
+    depthLimit = 2 * len(L).bit_length()
+    while True:
+        if len(L) <= 16:
+            return sorted(L)[index]
+        if depthLimit > 0:
+            depthLimit -= 1
+            pivot = sorted([L[0], L[len(L) // 2], L[-1]])[1]
+        else:
+            pivot = medianOfMedians(L)
+        less = [x for x in L if x < pivot]
+        if index < len(less):
+            L = less
+            continue
+        greater = [x for x in L if pivot < x]
+        numLessOrEqual = len(L) - len(greater)
+        if index < numLessOrEqual:
+            return pivot
+        index -= numLessOrEqual
+        L = greater
+
+def medianOfMedians(L):
+    medians = [sorted(L[i:i + 5])[(len(L[i:i + 5]) - 1) // 2] for i in range(0, len(L), 5)]
+    return introselect(medians, (len(medians) - 1) // 2)
+
+def kthLargestBatch(nums, ks):
+    """
+    Return [findKthLargest(nums, k) for k in ks] using one np.argpartition
+    call over all the requested positions.
+    """
+    if not isinstance(nums, (list, tuple, np.ndarray)):
+        nums = list(nums)
+    for k in ks:
+        if not 1 <= k <= len(nums):
+            raise ValueError(f'k must be between 1 and {len(nums)}, got {k}')
+    arr = selectionArray(nums)
+    positions = [len(arr) - k for k in ks]
+    order = np.argpartition(arr, positions)
+    return [pythonScalar(nums[order[i]]) for i in positions]
+
 def testFindKthLargest():
     assert(findKthLargest([3,2,1,5,6,4], 2) == 5)
     assert(findKthLargest([3,2,3,1,2,4,5,5,6], 4) == 4)
 
+    L = [(i * 7919) % 1009 for i in range(3000)] + [5] * 500
+    for k in [1, 2, 50, 1000, 1750, 3500]:
+        expected = sorted(L)[-k]
+        for strategy in ['auto', 'heap', 'numpy', 'introselect']:
+            assert(findKthLargest(L, k, strategy) == expected)
+    assert(findKthLargest(np.array(L), 100) == sorted(L)[-100])
+    assert(findKthLargest(['b', 'a', 'd', 'c'] * 10, 21) == 'b')
+    assert(kthLargestBatch(L, [1, 50, 3500]) == [sorted(L)[-k] for k in [1, 50, 3500]])
+    assert(all(type(x) is int for x in kthLargestBatch(iter(L), [1, 50])))
+
+    # any iterable, and always a Python scalar
+    for strategy in ['auto', 'heap', 'numpy', 'introselect']:
+        assert(findKthLargest({3, 1, 4, 5, 9, 2, 6}, 3, strategy) == 5)
+        assert(findKthLargest((x * x for x in range(10)), 2, strategy) == 64)
+    assert(type(findKthLargest(L, 1000, 'numpy')) is int)
+    assert(type(findKthLargest(np.array(L), 100)) is int)
+
+    assert(chooseSelectStrategy(L, 3) == 'heap')
+    assert(chooseSelectStrategy(L, 1000) == 'numpy')
+    assert(chooseSelectStrategy(['a'] * 100, 50) == 'introselect')
+
+    # ints past int64 compare as Python ints, mixed lists keep their types
+    big = [2**70, 3, 5, 2**65] * 10
+    for strategy in ['auto', 'heap', 'numpy', 'introselect']:
+        assert(findKthLargest(big, 30, strategy) == 5)
+        assert(findKthLargest(np.array(big, dtype=object), 30, strategy) == 5)
+    assert(kthLargestBatch(big, [1, 30]) == [2**70, 5])
+    assert(chooseSelectStrategy(big, 30) == 'introselect')
+    mixed = [1.5] + list(range(100))
+    assert(type(findKthLargest(mixed, 50)) is int and findKthLargest(mixed, 50) == 50)
+    assert(kthLargestBatch(mixed, [1, 99]) == [99, 1.5])
+    assert(findKthLargest([0.5, 2**53 + 1, 2**53] * 10, 10, 'numpy') == 2**53 + 1)
+
+    for strategy in ['auto', 'heap', 'numpy', 'introselect']:
+        for k in [0, 4, -1]:
+            try:
+                findKthLargest([3, 1, 2], k, strategy)
+                assert(False)
+            except ValueError:
+                pass
+    try:
+        kthLargestBatch([3, 1, 2], [1, 5])
+        assert(False)
+    except ValueError:
+        pass
+
 # Example: topKFrequent
 def topKFrequent(nums, k):
-    valToFreq = Counter(nums)
-    
+    return topKFromCounts(Counter(nums), k)
+
+def topKFromCounts(valToFreq, k):
     minHeap = [] # (freq, val) pair
     for val, freq in valToFreq.items():
         heapq.heappush(minHeap, (freq, val))
@@ -379,6 +1904,217 @@ def testTopKFrequent():
     assert(topKFrequent([1], 1) == [1])
     assert(topKFrequent([1,2,1,2,1,2,3,1,3,2], 2) == [1,2])
 
+# Sharded topKFrequent: workers count chunks (or files) into partial
+# Counters, the parent merges them as they arrive, and the heap runs once
+# over the merged counts. Each partial Counter crosses a process boundary
+# once; merging in shard order keeps Counter's first-occurrence key order,
+# so the result is exactly topKFrequent's.
+def countFile(path):
+    """
+    Return a Counter of the whitespace-separated tokens in a file.
+    """
+    valToFreq = Counter()
+    with open(path) as f:
+        for line in f:
+            valToFreq.update(line.split())
+    return valToFreq
+
+def mergeCounters(counters):
+    """
+    Sum an iterable of Counters in order into one Counter.
+    """
+    valToFreq = Counter()
+    for partial in counters:
+        valToFreq.update(partial)
+    return valToFreq
+
+def topKFrequentParallel(nums, k, numWorkers=None, chunkSize=None):
+    """
+    Return topKFrequent(nums, k), counting chunks of nums in parallel.
+
+    Args:
+        nums (list): Values to count.
+        k (int): Number of most frequent values to return.
+        numWorkers (int, optional): Number of processes. Defaults to the
+            number of CPUs.
+        chunkSize (int, optional): Values per worker task. Defaults to an
+            even split into one chunk per worker.
+    """
+    numWorkers = numWorkers or os.cpu_count() or 1
+    if chunkSize is None:
+        chunkSize = max(1, -(-len(nums) // numWorkers))
+    chunks = [nums[start:start + chunkSize] for start in range(0, len(nums), chunkSize)]
+    with multiprocessing.Pool(numWorkers) as pool:
+        valToFreq = mergeCounters(pool.imap(Counter, chunks))
+    return topKFromCounts(valToFreq, k)
+
+def topKFrequentFiles(paths, k, numWorkers=None):
+    """
+    topKFrequent over the whitespace-separated tokens of several files, one
+    worker task per file, read directly by the workers.
+    """
+    with multiprocessing.Pool(numWorkers or os.cpu_count() or 1) as pool:
+        valToFreq = mergeCounters(pool.imap(countFile, paths))
+    return topKFromCounts(valToFreq, k)
+
+def testTopKFrequentParallel():
+    nums = [1,2,1,2,1,2,3,1,3,2]
+    for chunkSize in [1, 3, 4, 10]:
+        assert(topKFrequentParallel(nums, 2, 2, chunkSize) == topKFrequent(nums, 2))
+    nums = [(i * i) % 37 for i in range(1000)]
+    for k in [1, 5, 20]:
+        assert(topKFrequentParallel(nums, k, 3, 70) == topKFrequent(nums, k))
+    assert(topKFrequentParallel([], 2, 2) == [])
+
+    symbols = ['AAPL', 'MSFT', 'AAPL', 'GOOG', 'MSFT', 'AAPL', 'TSLA']
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for i in range(3):
+            paths.append(os.path.join(tmp, f'shard{i}.txt'))
+            with open(paths[-1], 'w') as f:
+                f.write('\n'.join(symbols[i::3]) + '\n')
+        shards = symbols[0::3] + symbols[1::3] + symbols[2::3]
+        assert(topKFrequentFiles(paths, 2, 2) == topKFrequent(shards, 2))
+
+# Streaming top-k: counts change one event at a time, so instead of
+# rebuilding a heap over a full Counter, heap entries are pushed as counts
+# change and stale ones are skipped (lazy deletion).
+class TopKCounter:
+    """
+    Exact counts with a lazily updated max-heap for top-k queries.
+
+    Every `add` pushes the item's new count; entries whose count no longer
+    matches are stale and are dropped when they reach the top. The heap is
+    rebuilt from the counts only when stale entries outnumber live ones.
+    """
+    def __init__(self):
+        self.counts = {}
+        self.maxHeap = [] # (-count, seq, item)
+        self.seq = 0
+
+    def add(self, item, count=1):
+        """
+        Record `count` more occurrences of item. Time Complexity: O(log N) amortized
+        """
+        self.counts[item] = self.counts.get(item, 0) + count
+        heapq.heappush(self.maxHeap, (-self.counts[item], self.seq, item))
+        self.seq += 1
+        if len(self.maxHeap) > 2 * len(self.counts) + 16:
+            self.maxHeap = [(-freq, i, item) for i, (item, freq) in enumerate(self.counts.items())]
+            heapq.heapify(self.maxHeap)
+
+    def topK(self, k):
+        """
+        Return the k most frequent items, most frequent first.
+        """
+        res, live, seen = [], [], set()
+        while len(res) < k and len(self.maxHeap) > 0:
+            negFreq, seq, item = heapq.heappop(self.maxHeap)
+            # an unchanged count (add(item, 0)) leaves two matching entries;
+            # the second one is dropped like a stale one
+            if self.counts.get(item) == -negFreq and item not in seen:
+                seen.add(item)
+                res.append(item)
+                live.append((negFreq, seq, item))
+        for entry in live:
+            heapq.heappush(self.maxHeap, entry)
+        return res
+
+class SpaceSaving:
+    """
+    Approximate heavy hitters over an unbounded stream in O(capacity) memory.
+
+    At most `capacity` items are counted. When a new item arrives and the
+    table is full, the item with the smallest count m is replaced and the
+    newcomer starts at m + 1 with error m. Any item occurring more than
+    N / capacity times is guaranteed to be kept, and every estimate
+    overcounts by at most its error.
+    """
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.counts = {} # item : (count, error)
+        self.minHeap = [] # (count, seq, item), lazily updated
+        self.seq = 0
+
+    def _pushEntry(self, item):
+        heapq.heappush(self.minHeap, (self.counts[item][0], self.seq, item))
+        self.seq += 1
+        if len(self.minHeap) > 2 * self.capacity + 16:
+            self.minHeap = [(count, i, item) for i, (item, (count, _)) in enumerate(self.counts.items())]
+            heapq.heapify(self.minHeap)
+
+    def add(self, item, count=1):
+        """
+        Record `count` more occurrences of item. Time Complexity: O(log capacity) amortized
+        """
+        if item in self.counts:
+            freq, error = self.counts[item]
+            self.counts[item] = (freq + count, error)
+        elif len(self.counts) < self.capacity:
+            self.counts[item] = (count, 0)
+        else:
+            while True:
+                minFreq, _, minItem = heapq.heappop(self.minHeap)
+                if minItem in self.counts and self.counts[minItem][0] == minFreq:
+                    break
+            del self.counts[minItem]
+            self.counts[item] = (minFreq + count, minFreq)
+        self._pushEntry(item)
+
+    def estimate(self, item):
+        """
+        Return (estimated count, maximum overcount) for item; (0, 0) if untracked.
+        """
+        return self.counts.get(item, (0, 0))
+
+    def topK(self, k):
+        """
+        Return the k items with the largest estimated counts, largest first.
+        """
+        return heapq.nlargest(k, self.counts, key=lambda item: self.counts[item][0])
+
+def topKFrequentStream(stream, k, capacity=None):
+    """
+    topKFrequent over any iterable without holding it in memory.
+
+    Exact (TopKCounter) when capacity is None, otherwise approximate
+    (SpaceSaving) with at most `capacity` counters.
+    """
+    tracker = TopKCounter() if capacity is None else SpaceSaving(capacity)
+    for item in stream:
+        tracker.add(item)
+    return tracker.topK(k)
+
+def testTopKStream():
+    nums = [1,2,1,2,1,2,3,1,3,2,4,1]
+    assert(topKFrequentStream(iter(nums), 2) == [1, 2])
+    assert(topKFrequentStream(nums, 3) == [1, 2, 3])
+    assert(topKFrequentStream([], 3) == [])
+
+    counter = TopKCounter()
+    for item in 'aabbbc':
+        counter.add(item)
+    assert(counter.topK(2) == ['b', 'a'])
+    counter.add('c', 5) # counts change, the heap is not rebuilt
+    assert(counter.topK(2) == ['c', 'b'])
+    assert(counter.topK(10) == ['c', 'b', 'a'])
+    counter.add('c', 0)
+    counter.add('a', -1)
+    assert(counter.topK(2) == ['c', 'b'])
+    assert(counter.topK(3) == ['c', 'b', 'a'])
+
+    # heavy hitters survive a long tail of distinct items
+    stream = []
+    for i in range(2000):
+        stream += ['AAPL', 'MSFT', 'AAPL', f'tail{i}']
+    assert(topKFrequentStream(stream, 2, capacity=10) == ['AAPL', 'MSFT'])
+    tracker = SpaceSaving(10)
+    for item in stream:
+        tracker.add(item)
+    count, error = tracker.estimate('AAPL')
+    assert(count - error <= 4000 <= count)
+    assert(len(tracker.counts) == 10)
+
 # Example: kSmallestPairs
 def kSmallestPairs(nums1, nums2, k):
     """
@@ -389,8 +2125,8 @@ def kSmallestPairs(nums1, nums2, k):
     where u is from nums1 and v is from nums2 such that the sum u + v
     is among the k smallest possible pair sums.
 
-    The function uses a min-heap to efficiently generate the next smallest
-    pair sum in O(k log k) time complexity.
+    The function takes the first k pairs from `iterSmallestPairs`, whose
+    min-heap only holds the frontier of candidate pairs, in O(k log k) time.
 
     Args:
         nums1 (list[int]): The first sorted integer array.
@@ -404,17 +2140,46 @@ def kSmallestPairs(nums1, nums2, k):
     Time Complexity:
         O(k log k)
     """
-    n1, n2 = len(nums1), len(nums2)
-    minHeap = [] # (sums, i, j)
-    for i in range(n1):
-        heapq.heappush(minHeap, (nums1[i] + nums2[0], i, 0))
-    res = []
-    while len(res) < k and len(minHeap) > 0:
-        currSum, i, j = heapq.heappop(minHeap)
-        res.append([nums1[i], nums2[j]])
-        if j + 1 < n2:
-            heapq.heappush(minHeap, (nums1[i] + nums2[j + 1], i, j + 1))    
-    return res
+    return list(itertools.islice(iterSmallestPairs(nums1, nums2), max(k, 0)))
+
+def iterSmallestPairs(nums1, nums2):
+    """
+    Lazily yield pairs [u, v] from two sorted arrays in order of u + v.
+
+    Same order as kSmallestPairs (ties by index in nums1, then nums2), but
+    pairs are produced on demand and the heap only ever holds the frontier:
+    at most min(k, len(nums1)) + 1 entries after k pairs.
+    """
+    return iterSmallestCombinations([nums1, nums2])
+
+def iterSmallestCombinations(arrays):
+    """
+    Lazily yield one element from each of m sorted arrays, as a list, in
+    order of the sum of the chosen elements (ties by index tuple).
+
+    Every index tuple t has one parent: t with its last non-zero coordinate
+    decremented. So when t is popped we only push the tuples that increment
+    a coordinate at or after that position. The parent never has a larger
+    sum, so the next smallest combination is always on the frontier, and no
+    tuple is pushed twice. After k combinations the heap holds at most
+    1 + (m - 1) * k entries.
+
+    Time Complexity: O(k * m * log(m * k)) for the first k combinations.
+    """
+    m = len(arrays)
+    if m == 0 or any(len(nums) == 0 for nums in arrays):
+        return
+    start = (0,) * m
+    minHeap = [(sum(nums[0] for nums in arrays), start)] # (sum, indices)
+    while len(minHeap) > 0:
+        currSum, indices = heapq.heappop(minHeap)
+        yield [arrays[d][i] for d, i in enumerate(indices)]
+        last = max((d for d in range(m) if indices[d] > 0), default=0)
+        for d in range(last, m):
+            i = indices[d]
+            if i + 1 < len(arrays[d]):
+                nxt = indices[:d] + (i + 1,) + indices[d + 1:]
+                heapq.heappush(minHeap, (currSum - arrays[d][i] + arrays[d][i + 1], nxt))
 
 def testKSmallestPairs():
     assert(kSmallestPairs([1,7,11], [2,4,6], 3) == [[1,2],[1,4],[1,6]])
@@ -423,24 +2188,237 @@ def testKSmallestPairs():
     assert(kSmallestPairs([1,2,4,5,6], [3,5,7,9], 20) == [[1,3],[2,3],[1,5],[2,5],[4,3],[1,7],[5,3],[2,7],[4,5],[6,3],[1,9],[5,5],[2,9],[4,7],[6,5],[5,7],[4,9],[6,7],[5,9],[6,9]])
 
 
+def testIterSmallestCombinations():
+    pairs = iterSmallestPairs([1,2,4,5,6], [3,5,7,9])
+    assert(next(pairs) == [1, 3] and next(pairs) == [2, 3] and next(pairs) == [1, 5])
+    assert(list(iterSmallestPairs([1, 2], [])) == [])
+    assert(kSmallestPairs([1, 2], [], 3) == [])
+    assert(kSmallestPairs([1, 2], [3, 4], 0) == [])
+    assert(kSmallestPairs([1, 2], [3, 4], -1) == [])
+
+    arrays = [[1, 4, 9], [0, 2], [3, 3, 10]]
+    res = list(iterSmallestCombinations(arrays))
+    assert(len(res) == 18)
+    expected = sorted(([a, b, c] for a in arrays[0] for b in arrays[1] for c in arrays[2]), key=sum)
+    assert([sum(combo) for combo in res] == [sum(combo) for combo in expected])
+    assert(sorted(res) == sorted(expected))
+    assert(list(iterSmallestCombinations([[5, 6]])) == [[5], [6]])
+
 ################################################################################
 # Data Structure: Min/Max Heap
 
 # Algorithm Name: Minimum Completion Time -- Event-driven simulation
 ################################################################################
 
-def fastestPizzaProduction(cookTimes, numPizzas):
-    availableWorkers = [] # (availableTime, cookTime)
-    for cookTime in cookTimes:
-        heapq.heappush(availableWorkers, (cookTime, cookTime))
-    
-    currTime = 0
-    while numPizzas > 0:
-        currTime, cookTime = heapq.heappop(availableWorkers)
-        nxtAvailableTime = currTime + cookTime
-        heapq.heappush(availableWorkers, (nxtAvailableTime, cookTime))
-        numPizzas -= 1
-    return currTime
+class WorkerPoolSimulation:
+    """
+    Discrete-event simulation of workers that each process jobs back to back.
+
+    Worker w's service time is either a fixed duration or a policy function
+    serviceTimes[w](jobsDone) -> duration, where jobsDone counts the jobs w
+    has already finished. Speedups after N jobs are just another policy;
+    fixed durations skip the per-job call. While durations are ints, every
+    pending event is packed into one int, finishTime * numWorkers + worker,
+    so the event queue is a flat heap of ints with no tuple per job;
+    otherwise it is a heap of (finishTime, worker).
+
+    `advance` moves every worker finishing at the same instant in one batch;
+    `run` completes jobs one at a time in a tight loop.
+
+    Args:
+        serviceTimes (list[float | function]): One duration or service-time
+            policy per worker. A policy whose first duration is an int must
+            keep returning ints.
+    """
+    def __init__(self, serviceTimes):
+        self.serviceTimes = serviceTimes
+        numWorkers = len(serviceTimes)
+        self.fixed = [not callable(serviceTime) for serviceTime in serviceTimes]
+        self.currentJob = [serviceTime(0) if callable(serviceTime) else serviceTime
+                           for serviceTime in serviceTimes]
+        self.jobsDone = [0] * numWorkers
+        self.busyTime = [0] * numWorkers
+        self.packed = all(isinstance(duration, int) for duration in self.currentJob)
+        if self.packed:
+            self.events = [duration * numWorkers + worker
+                           for worker, duration in enumerate(self.currentJob)]
+        else:
+            self.events = [(duration, worker) for worker, duration in enumerate(self.currentJob)]
+        heapq.heapify(self.events)
+        self.time = 0
+        self.completed = 0
+
+    def nextEvent(self):
+        """
+        Return (finishTime, worker) of the next job to finish, without
+        removing it.
+        """
+        if self.packed:
+            return divmod(self.events[0], len(self.serviceTimes))
+        return self.events[0]
+
+    def startJob(self, worker, currTime):
+        """
+        Count the job `worker` finished at currTime and return the event of
+        its next job.
+        """
+        self.busyTime[worker] += self.currentJob[worker]
+        self.jobsDone[worker] += 1
+        if not self.fixed[worker]:
+            self.currentJob[worker] = self.serviceTimes[worker](self.jobsDone[worker])
+        if self.packed:
+            return (currTime + self.currentJob[worker]) * len(self.serviceTimes) + worker
+        return currTime + self.currentJob[worker], worker
+
+    def advance(self):
+        """
+        Jump to the next finish time, complete every job ending then, and
+        start each of those workers on its next job.
+
+        Returns:
+            tuple: (time, list of workers that finished a job)
+        """
+        currTime = self.nextEvent()[0]
+        finished = []
+        while len(self.events) > 0 and self.nextEvent()[0] == currTime:
+            finished.append(self.nextEvent()[1])
+            heapq.heappop(self.events)
+        for worker in finished:
+            heapq.heappush(self.events, self.startJob(worker, currTime))
+        self.time = currTime
+        self.completed += len(finished)
+        return currTime, finished
+
+    def run(self, numJobs):
+        """
+        Complete jobs until numJobs are done in total and return the time
+        the last of them finished (0 if numJobs <= 0 and nothing is done).
+        Raises ValueError if more than numJobs jobs are already done, since
+        that time has passed.
+
+        Time Complexity: O(numJobs log W), one heapreplace per job
+        """
+        if max(numJobs, 0) < self.completed:
+            raise ValueError(f'{self.completed} jobs are already done, cannot run to {numJobs}')
+        events, serviceTimes, fixed = self.events, self.serviceTimes, self.fixed
+        jobsDone, busyTime, currentJob = self.jobsDone, self.busyTime, self.currentJob
+        numWorkers, packed = len(serviceTimes), self.packed
+        currTime = self.time
+        for _ in range(numJobs - self.completed):
+            if packed:
+                currTime, worker = divmod(events[0], numWorkers)
+            else:
+                currTime, worker = events[0]
+            busyTime[worker] += currentJob[worker]
+            jobsDone[worker] += 1
+            if not fixed[worker]:
+                currentJob[worker] = serviceTimes[worker](jobsDone[worker])
+            finishTime = currTime + currentJob[worker]
+            heapq.heapreplace(events, finishTime * numWorkers + worker if packed
+                                      else (finishTime, worker))
+        self.time = currTime
+        self.completed = max(self.completed, numJobs)
+        return self.time
+
+    def utilization(self):
+        """
+        Return, per worker, the fraction of [0, time] spent on finished jobs.
+        """
+        if self.time == 0:
+            return [0.0] * len(self.serviceTimes)
+        return [busy / self.time for busy in self.busyTime]
+
+def constantServiceTime(duration):
+    """
+    Constant service time policy. A plain duration is accepted as a policy
+    and never called, so this returns it as is.
+    """
+    return duration
+
+def speedupServiceTime(duration, speedup, afterJobs=2):
+    """
+    Service time policy: `duration` per job, `duration - speedup` once the
+    worker has finished `afterJobs` jobs.
+    """
+    return lambda jobsDone: duration if jobsDone < afterJobs else duration - speedup
+
+def testWorkerPoolSimulation():
+    simulation = WorkerPoolSimulation([constantServiceTime(2), constantServiceTime(4)])
+    assert(simulation.advance() == (2, [0]))
+    assert(simulation.advance() == (4, [0, 1])) # both finish at t = 4
+    assert(simulation.run(4) == 6)
+    assert(list(simulation.jobsDone) == [3, 1] and simulation.completed == 4)
+    simulation.advance()
+    assert(simulation.time == 8 and simulation.completed == 6)
+    assert(simulation.utilization() == [1.0, 1.0])
+
+    simulation = WorkerPoolSimulation([constantServiceTime(3), constantServiceTime(5)])
+    assert(simulation.run(2) == 5)
+    assert(simulation.utilization() == [3 / 5, 1.0])
+    assert(WorkerPoolSimulation([constantServiceTime(3)]).run(0) == 0)
+    assert(simulation.run(2) == 5) # already done: same time
+    try:
+        simulation.run(1)
+        assert(False)
+    except ValueError:
+        pass
+
+    # policies, float durations (tuple events) and int durations agree
+    policies = [speedupServiceTime(4, 1), 3, speedupServiceTime(5, 3, afterJobs=1)]
+    packed = WorkerPoolSimulation(policies)
+    unpacked = WorkerPoolSimulation([speedupServiceTime(4.0, 1.0), 3.0,
+                                     speedupServiceTime(5.0, 3.0, afterJobs=1)])
+    assert(packed.packed and not unpacked.packed)
+    for numJobs in [1, 5, 20]:
+        assert(packed.run(numJobs) == unpacked.run(numJobs))
+    assert(packed.jobsDone == unpacked.jobsDone and packed.advance() == unpacked.advance())
+
+def fastestPizzaProduction(cookTimes, numPizzas, method='auto'):
+    """
+    Return the time at which the numPizzas-th pizza is finished, when every
+    worker i cooks pizzas back to back, each taking cookTimes[i].
+
+    Methods:
+        'simulate': pop/push a heap of workers once per pizza,
+            O(numPizzas log W). Kept as the reference implementation.
+        'binarySearch': `fastestPizzaProductionSearch`,
+            O(W log(numPizzas * min(cookTimes))); integer cook times only.
+        'auto': 'binarySearch' for integer cook times, else 'simulate'.
+    """
+    if method == 'auto':
+        isInteger = all(isinstance(cookTime, (int, np.integer)) for cookTime in cookTimes)
+        method = 'binarySearch' if isInteger else 'simulate'
+    if method == 'binarySearch':
+        return fastestPizzaProductionSearch(cookTimes, numPizzas)
+    elif method != 'simulate':
+        raise ValueError(f'unknown method: {method}')
+
+    workers = WorkerPoolSimulation([constantServiceTime(cookTime) for cookTime in cookTimes])
+    return workers.run(numPizzas)
+
+def fastestPizzaProductionSearch(cookTimes, numPizzas):
+    """
+    Binary search on the completion time T.
+
+    By time T worker i has finished floor(T / cookTimes[i]) pizzas, and this
+    count only grows with T, so the answer is the smallest T whose total
+    count reaches numPizzas. Each count is one vectorized NumPy step.
+
+    Time Complexity: O(W log(numPizzas * min(cookTimes)))
+    """
+    if numPizzas <= 0:
+        return 0
+    lo, hi = 0, int(np.min(cookTimes)) * numPizzas # the fastest worker alone suffices
+    # a count sums up to len(cookTimes) * hi; past int64 use Python ints
+    dtype = np.int64 if hi * len(cookTimes) < 2**63 else object
+    cookTimes = np.asarray(cookTimes, dtype=dtype)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if int(np.sum(mid // cookTimes)) >= numPizzas:
+            hi = mid
+        else:
+            lo = mid + 1
+    return lo
 
 def testFastestPizzaProduction():
     cookTimes = [2, 6, 4, 1]
@@ -465,6 +2443,17 @@ def testFastestPizzaProduction():
     assert(fastestPizzaProduction([1, 100], 10) == 10)
     assert(fastestPizzaProduction([1, 100], 101) == 100)
 
+    for cookTimes in [[2, 6, 4, 1], [3], [2, 2, 2], [1, 2], [1, 10, 3, 7], [1, 100]]:
+        for numPizzas in range(0, 120, 7):
+            expected = fastestPizzaProduction(cookTimes, numPizzas, 'simulate')
+            assert(fastestPizzaProduction(cookTimes, numPizzas, 'binarySearch') == expected)
+    assert(fastestPizzaProduction([2.5, 4.0], 3) == 5.0) # floats are simulated
+    T = fastestPizzaProduction([7, 11, 13], 10**9)
+    assert(T // 7 + T // 11 + T // 13 >= 10**9)
+    assert((T - 1) // 7 + (T - 1) // 11 + (T - 1) // 13 < 10**9)
+    assert(fastestPizzaProduction([1000], 10**17) == 10**20) # past int64
+    assert(fastestPizzaProduction([3, 2**62], 2) == 6)
+
 # Example: minMeetingRooms
 def minMeetingRooms(intervals):
     """
@@ -489,10 +2478,9 @@ def minMeetingRooms(intervals):
     Time Complexity:
         O(N log N) — Sorting intervals and using a heap for active meetings.
     """
-    intervals.sort()
     rooms = 0
     roomSchedule = [] # (endTime) pair
-    for start, end in intervals:   
+    for start, end in sorted(intervals):   
         while len(roomSchedule) > 0 and start >= roomSchedule[0]:
             heapq.heappop(roomSchedule)
         heapq.heappush(roomSchedule, end)
@@ -529,22 +2517,198 @@ def testMinMeetingRooms():
     assert(minMeetingRooms([(1, 2)]) == 1)
     assert(minMeetingRooms([]) == 0)
 
-def fastestGradingTime(gradingTimes, speedups, numQuizzes):
-    availableTA = [] # (availableTime, gradingTime, speedups, numQuizzesGraded)
+def minMeetingRoomsSweep(intervals, returnAssignment=False):
+    """
+    Sweep-line version of `minMeetingRooms` for millions of intervals.
 
-    for i in range(len(gradingTimes)):
-        heapq.heappush(availableTA, (gradingTimes[i], gradingTimes[i], speedups[i], 1))
+    Every interval contributes a +1 event at its start and a -1 event at its
+    end. The events are ordered with one NumPy lexsort (ends before starts at
+    equal times, since a room freed at t can be reused at t), and the answer
+    is the maximum of the running sum. The input is not modified.
 
-    currTime = 0
-    while numQuizzes > 0:
-        currTime, gradingTime, speedup, numQuizzesGraded = heapq.heappop(availableTA)
-        if numQuizzesGraded == 2:
-            newGradingTime, newSpeedup = gradingTime - speedup, 0
-        else:
-            newGradingTime, newSpeedup = gradingTime, speedup
-        heapq.heappush(availableTA, (currTime + newGradingTime, newGradingTime, newSpeedup, numQuizzesGraded + 1))
-        numQuizzes -= 1
-    return currTime
+    Args:
+        intervals (list[tuple[int, int]] | np.ndarray): [start, end) pairs.
+        returnAssignment (bool): Also return the room of every interval.
+
+    Returns:
+        int | tuple[int, list[int]]: The number of rooms, plus (with
+        returnAssignment) assignment[i], the room of intervals[i].
+
+    Time Complexity: O(N log N), vectorized; the assignment adds an
+        O(N log N) Python pass.
+    """
+    arr = np.asarray(intervals).reshape(-1, 2)
+    n = len(arr)
+    times = np.concatenate((arr[:, 0], arr[:, 1]))
+    deltas = np.concatenate((np.ones(n, dtype=np.int64), -np.ones(n, dtype=np.int64)))
+    order = np.lexsort((deltas, times))
+    rooms = int(np.cumsum(deltas[order]).max()) if n > 0 else 0
+    if not returnAssignment:
+        return rooms
+
+    assignment = [0] * n
+    busyRooms = [] # (endTime, room)
+    freeRooms = list(range(rooms)) # a sorted list is a valid min-heap
+    for i in np.argsort(arr[:, 0], kind='stable').tolist():
+        start, end = arr[i].tolist()
+        while len(busyRooms) > 0 and busyRooms[0][0] <= start:
+            heapq.heappush(freeRooms, heapq.heappop(busyRooms)[1])
+        room = heapq.heappop(freeRooms)
+        assignment[i] = room
+        heapq.heappush(busyRooms, (end, room))
+    return rooms, assignment
+
+def testMinMeetingRoomsSweep():
+    cases = [[(5, 6), (1, 4), (2, 3)], [(0, 10), (1, 5), (2, 7), (3, 8), (9, 12)],
+             [(0, 30), (5, 10), (15, 20)], [(1, 5), (6, 9), (1, 5), (3, 6)],
+             [(1, 5), (2, 6), (3, 7), (6, 10)], [(0, 1), (1, 2), (2, 3)], [(1, 2)], []]
+    for intervals in cases:
+        original = copy.deepcopy(intervals)
+        rooms = minMeetingRoomsSweep(intervals)
+        assert(rooms == minMeetingRooms(intervals))
+        assert(intervals == original) # neither version mutates the input
+
+        rooms, assignment = minMeetingRoomsSweep(intervals, returnAssignment=True)
+        assert(len(assignment) == len(intervals))
+        assert(set(assignment) == set(range(rooms)))
+        for i in range(len(intervals)):
+            for j in range(i + 1, len(intervals)):
+                if assignment[i] == assignment[j]:
+                    (s1, e1), (s2, e2) = intervals[i], intervals[j]
+                    assert(e1 <= s2 or e2 <= s1)
+
+    # rooms are handed out lowest number first
+    assert(minMeetingRoomsSweep([(0, 1)] * 3, True) == (3, [0, 1, 2]))
+    assert(minMeetingRoomsSweep([(0, 4), (1, 2), (3, 5)], True) == (2, [0, 1, 1]))
+
+class IntervalIndex:
+    """
+    Online minMeetingRooms: intervals are inserted and cancelled one at a
+    time while the number of rooms needed stays available.
+
+    A segment tree over the compressed time coordinates stores, for each
+    elementary slot [times[k], times[k + 1]), how many intervals cover it.
+    Inserting or removing [start, end) is a range add of +1 / -1, and rooms
+    needed is a range max. Each node keeps its pending add instead of
+    pushing it down, so both operations are O(log T).
+
+    Args:
+        times (list[int]): Every time an interval may start or end at.
+    """
+    def __init__(self, times):
+        self.times = sorted(set(times))
+        self.numSlots = max(len(self.times) - 1, 1)
+        self.maxCover = [0] * (4 * self.numSlots)
+        self.pending = [0] * (4 * self.numSlots)
+        self.intervals = Counter() # (start, end) : count
+
+    def __len__(self):
+        return sum(self.intervals.values())
+
+    def _slot(self, time):
+        k = bisect.bisect_left(self.times, time)
+        if k == len(self.times) or self.times[k] != time:
+            raise ValueError(f'{time} is not one of the index times')
+        return k
+
+    def _update(self, node, lo, hi, l, r, delta):
+        if r <= lo or hi <= l:
+            return
+        if l <= lo and hi <= r:
+            self.pending[node] += delta
+            self.maxCover[node] += delta
+            return
+        mid = (lo + hi) // 2
+        self._update(2 * node, lo, mid, l, r, delta)
+        self._update(2 * node + 1, mid, hi, l, r, delta)
+        self.maxCover[node] = self.pending[node] + max(self.maxCover[2 * node], self.maxCover[2 * node + 1])
+
+    def _query(self, node, lo, hi, l, r):
+        if r <= lo or hi <= l:
+            return 0
+        if l <= lo and hi <= r:
+            return self.maxCover[node]
+        mid = (lo + hi) // 2
+        return self.pending[node] + max(self._query(2 * node, lo, mid, l, r),
+                                        self._query(2 * node + 1, mid, hi, l, r))
+
+    def insert(self, start, end):
+        """
+        Book [start, end); raises ValueError unless start < end.
+        Time Complexity: O(log T)
+        """
+        if start >= end:
+            raise ValueError(f'({start}, {end}) is an empty interval')
+        self._update(1, 0, self.numSlots, self._slot(start), self._slot(end), 1)
+        self.intervals[(start, end)] += 1
+
+    def remove(self, start, end):
+        """
+        Cancel a booking of [start, end). Time Complexity: O(log T)
+        """
+        if self.intervals[(start, end)] == 0:
+            raise ValueError(f'({start}, {end}) is not booked')
+        self.intervals[(start, end)] -= 1
+        if self.intervals[(start, end)] == 0:
+            del self.intervals[(start, end)]
+        self._update(1, 0, self.numSlots, self._slot(start), self._slot(end), -1)
+
+    def roomsNeeded(self):
+        """
+        Return the rooms needed for every current booking. Time Complexity: O(1)
+        """
+        return self.maxCover[1]
+
+    def roomsNeededBetween(self, a, b):
+        """
+        Return the rooms needed during [a, b) (any times, not only index
+        times); 0 for an empty or inverted range. Time Complexity: O(log T)
+        """
+        if a >= b:
+            return 0
+        l = max(bisect.bisect_right(self.times, a) - 1, 0)
+        r = bisect.bisect_left(self.times, b)
+        return self._query(1, 0, self.numSlots, l, min(r, self.numSlots))
+
+def testIntervalIndex():
+    intervals = [(0, 10), (1, 5), (2, 7), (3, 8), (9, 12)]
+    index = IntervalIndex([t for interval in intervals for t in interval])
+    for start, end in intervals:
+        index.insert(start, end)
+    assert(index.roomsNeeded() == minMeetingRooms(intervals) == 4)
+    assert(index.roomsNeededBetween(8, 12) == 2)
+    assert(index.roomsNeededBetween(10, 12) == 1)
+    assert(index.roomsNeededBetween(0, 2) == 2)
+    assert(index.roomsNeededBetween(12, 20) == 0)
+    assert(index.roomsNeededBetween(3.5, 4) == 4)
+    assert(index.roomsNeededBetween(4, 4) == 0 and index.roomsNeededBetween(8, 3) == 0)
+
+    index.remove(2, 7) # cancellation
+    assert(index.roomsNeeded() == 3 and len(index) == 4)
+    index.remove(3, 8)
+    index.insert(9, 12)
+    assert(index.roomsNeeded() == 3) # (0, 10) and (9, 12) twice
+    assert(index.roomsNeededBetween(1, 3) == 2)
+
+    assert((2, 7) not in index.intervals and (3, 8) not in index.intervals)
+    try:
+        index.remove(2, 7)
+        assert(False)
+    except ValueError:
+        pass
+    for start, end in [(5, 5), (10, 1)]:
+        try:
+            index.insert(start, end)
+            assert(False)
+        except ValueError:
+            pass
+    assert(index.roomsNeeded() == 3 and len(index) == 4)
+
+def fastestGradingTime(gradingTimes, speedups, numQuizzes):
+    # each TA gets faster by their speedup after grading two quizzes
+    TAs = WorkerPoolSimulation([speedupServiceTime(gradingTime, speedup)
+                                for gradingTime, speedup in zip(gradingTimes, speedups)])
+    return TAs.run(numQuizzes)
 
 def testFastestGradingTime():
     gradingTimes = [2, 6, 4, 3]
@@ -593,7 +2757,7 @@ def testFastestGradingTime():
 
 # Algorithm Name: Minimum Completion Time -- Time-driven simulation
 ################################################################################
-def leastInterval(tasks, n):
+def leastInterval(tasks, n, mode='formula'):
     """
     Return the minimum number of CPU intervals required to finish all tasks.
 
@@ -608,6 +2772,10 @@ def leastInterval(tasks, n):
         tasks (list[str]): A list of uppercase letters representing task types.
             Each element corresponds to one execution of that task.
         n (int): The required number of idle intervals between identical tasks.
+        mode (str): 'formula' (closed form, O(T + K)), 'jump' (event
+            simulation that skips idle stretches, see
+            `leastIntervalSchedule`) or 'simulate' (one loop step per
+            interval, idle or not).
 
     Returns:
         int: The minimum number of time units to complete all tasks.
@@ -618,9 +2786,17 @@ def leastInterval(tasks, n):
         # One optimal schedule: A → B → idle → A → B → idle → A → B
 
     Time Complexity:
-        O(T log K), where T is the total number of tasks and
-        K is the number of distinct task types (heap operations per task).
+        'formula': O(T + K); 'jump': O(T log K); 'simulate': O(T log K + idle
+        intervals), where T is the total number of tasks and K is the
+        number of distinct task types.
     """
+    if mode == 'formula':
+        return leastIntervalFormula(tasks, n)
+    elif mode == 'jump':
+        return leastIntervalSchedule(tasks, n)[0]
+    elif mode != 'simulate':
+        raise ValueError(f'unknown mode: {mode}')
+
     cooldown = deque() # (availableTime, numTasksLeft) pair
     taskToFreq = Counter(tasks)
     availableTask = [-freq for freq in taskToFreq.values()]
@@ -640,11 +2816,85 @@ def leastInterval(tasks, n):
 
     return time
 
+def leastIntervalFormula(tasks, n):
+    """
+    Closed form for leastInterval.
+
+    The most frequent task (frequency f) needs f - 1 full frames of n + 1
+    intervals, plus a final frame holding every task that also has
+    frequency f. If the other tasks do not fit in the idle slots, there is
+    no idle time at all and the answer is len(tasks).
+
+    Time Complexity: O(T + K)
+    """
+    if len(tasks) == 0:
+        return 0
+    freqs = Counter(tasks).values()
+    maxFreq = max(freqs)
+    numMaxFreq = sum(1 for freq in freqs if freq == maxFreq)
+    return max(len(tasks), (maxFreq - 1) * (n + 1) + numMaxFreq)
+
+def leastIntervalSchedule(tasks, n):
+    """
+    Return (total time, schedule) for an optimal leastInterval schedule.
+
+    Same greedy as leastInterval's simulation (always run the available
+    task with the most executions left), but when nothing is available the
+    clock jumps straight to the next cooldown expiry instead of ticking
+    through the idle intervals.
+
+    Returns:
+        tuple: (int total intervals, list of (interval, task) pairs with
+        1-based intervals; missing intervals are idle)
+
+    Time Complexity: O(T log K)
+    """
+    taskTypes = list(Counter(tasks).items())
+    availableTask = [(-freq, i) for i, (task, freq) in enumerate(taskTypes)]
+    heapq.heapify(availableTask)
+    cooldown = deque() # (availableTime, -numTasksLeft, taskIdx)
+
+    time = 0
+    schedule = []
+    while len(cooldown) > 0 or len(availableTask) > 0:
+        if len(availableTask) == 0:
+            time = cooldown[0][0] # skip the idle intervals
+            while len(cooldown) > 0 and cooldown[0][0] <= time:
+                heapq.heappush(availableTask, cooldown.popleft()[1:])
+        time += 1
+
+        negRemaining, i = heapq.heappop(availableTask)
+        schedule.append((time, taskTypes[i][0]))
+        if negRemaining + 1 != 0:
+            cooldown.append((time + n, negRemaining + 1, i))
+
+        while len(cooldown) > 0 and cooldown[0][0] <= time:
+            heapq.heappush(availableTask, cooldown.popleft()[1:])
+
+    return time, schedule
+
 def testLeastInterval():
     assert(leastInterval(["A","A","A","B","B","B"], 2) == 8)
     assert(leastInterval(["A","C","A","B","D","B"], 1) == 6)
     assert(leastInterval(["A","A","A", "B","B","B"], 3) == 10)
 
+    cases = [(["A","A","A","B","B","B"], 2), (["A","C","A","B","D","B"], 1),
+             (["A","A","A","B","B","B"], 3), (["A","A","A","B","C","D","E"], 2),
+             (["A"] * 4 + ["B"] * 2, 0), ([], 5)]
+    for tasks, n in cases:
+        expected = leastInterval(tasks, n, mode='simulate')
+        assert(leastInterval(tasks, n) == expected)
+        assert(leastInterval(tasks, n, mode='jump') == expected)
+
+    time, schedule = leastIntervalSchedule(["A","A","A","B","B","B"], 2)
+    assert(time == 8)
+    assert(schedule == [(1, "A"), (2, "B"), (4, "A"), (5, "B"), (7, "A"), (8, "B")])
+
+    # a long cooldown is skipped, not stepped through
+    time, schedule = leastIntervalSchedule(["A", "A", "B"], 10**9)
+    assert(time == 10**9 + 2 and schedule == [(1, "A"), (2, "B"), (10**9 + 2, "A")])
+    assert(leastInterval(["A", "A", "B"], 10**9) == 10**9 + 2)
+
 ################################################################################
 # Algorithm Name: Recursion
 #
@@ -1743,24 +3993,45 @@ def testBellmanFord():
 def main():
     # Prefix Algorithm
     testAveragePrices()
+    testPriceSeries()
+    testStreamingPriceSeries()
+    testMappedPriceSeries()
+    testPriceMatrix()
     testCountSublists()
+    testPrefixSumIndex()
+    testCountSublistsParallel()
     testProductExceptSelf()
+    testProductExceptSelfVectorized()
     testQueryProducts()
+    testRangeProduct()
+    testRangeTrees()
+    testSparseTable()
     testBalanceIndex()
 
     # Monotonic Stack Algorithm
+    testMonotonicStack()
     testNextGreaterElement()
     testDailyTemperatures()
+    testNextGreaterElementStream()
     testStockSpan()
+    testStockSpanner()
+    testStockSpanBatch()
+    testRangeBounds()
 
     # kLargest / kSmallest 
     testFindKthLargest()
     testTopKFrequent()
+    testTopKFrequentParallel()
+    testTopKStream()
     testKSmallestPairs()
+    testIterSmallestCombinations()
 
     # Minimum Completion Time Algorithm
+    testWorkerPoolSimulation()
     testFastestPizzaProduction()
     testMinMeetingRooms()
+    testMinMeetingRoomsSweep()
+    testIntervalIndex()
     testFastestGradingTime()
 
     testLeastInterval()
@@ -1792,6 +4063,7 @@ def main():
 
 
 
-main()
+if __name__ == '__main__':
+    main()
 
 